@@ -14,6 +14,9 @@
 # The following is support code. DO NOT CHANGE.
 
 from a1_support import *
+from a1_solver import rank_directions, solve
+from a1_render import ViewportRenderer
+from a1_cache import load_cached_maze, update_cache
 def get_position_in_direction(position, direction):
     """
     takes a row, column pair representing a position and a direction character
@@ -38,21 +41,27 @@ def get_position_in_direction(position, direction):
 
 def print_maze(maze, position):
     """
-    takes a maze string and the position of the player
+    takes a maze string (or parsed Maze) and the position of the player
     print the maze with the player shown as an 'A'.
-    print_maze(str, (int, int)) -> maze
+    print_maze(str|Maze, (int, int)) -> maze
     """ 
     user_in_maze = position_to_index(position, maze_columns(maze))
 
-    print (maze[:user_in_maze] + 'A' + maze[user_in_maze+1:])
+    if isinstance(maze, str):
+        print (maze[:user_in_maze] + 'A' + maze[user_in_maze+1:])
+    else:
+        for text in maze.iter_text(user_in_maze):
+            print(text, end='')
+        print()
             
 def move(maze, position, direction):
     """
-    takes a maze string, a position of a square and a direction.
+    takes a maze string (or parsed Maze), a position of a square and a
+    direction.
     returns a pair of form (position, square) where position is the position
     after the move and square is the resulting square after the move.
     Pre-condition: if move is invalid, the new position returned is the same as the old position.
-    move(str, (int, int), str) -> ((int, int), str)
+    move(str|Maze, (int, int), str) -> ((int, int), str)
     """
     x, y = get_position_in_direction(position, direction)
     user_in_maze = position_to_index((x,y), maze_columns(maze))
@@ -63,10 +72,15 @@ def move(maze, position, direction):
 
 def get_legal_directions (maze, position):
     """
-    takes a maze string and a position
+    takes a maze string (or parsed Maze) and a position
     returns a list of legal direction for that square
-    get_legal_directions(str, (int, int)) -> [str, str]
+    get_legal_directions(str|Maze, (int, int)) -> [str, str]
     """
+    if not isinstance(maze, str):
+        mask = maze.get_legal_mask(
+            position_to_index(position, maze.get_columns()))
+        return list(MASK_DIRECTIONS[mask])
+
     directions = ()
     legal_directions = []
     for directions in ['n', 's', 'e', 'w']:
@@ -76,53 +90,85 @@ def get_legal_directions (maze, position):
             legal_directions.append(directions)
     return legal_directions
 
-def interact():
+def play_command(maze, history, command, ask=input, write=print):
+    """
+    carries out a single interact command on maze, where history is the
+    MoveHistory of the game so far (updated in place), ask is called to ask a
+    question (like input) and write is called with each message (like print).
+    returns GAME_WON, GAME_LOST or GAME_QUIT if the command ended the game,
+    else None.
+    play_command(str|Maze, MoveHistory, str, func, func) -> str
+    """
+    if command in DIRECTIONS and len(command) != 1:
+        # '', 'ns', 'nsew' and the like are no move at all
+        pass
+    elif command in DIRECTIONS:
+        position, direction = move(maze, history.get_position(), command)
+        if direction == '#':
+            write("You can't go in that direction.")
+        elif direction in BAD_POKEMON:
+            write(LOSE_TEXT.format(POKEMON[direction]))
+            return GAME_LOST
+        elif direction == GOOD_POKEMON:
+            write(WIN_TEXT.format(POKEMON[direction]))
+            return GAME_WON
+        elif direction == ' ':
+            history.move(command)
+    elif command == 'r':
+        history.reset()
+    elif command =='b':
+        if not history.back():
+            write("You cannot go back from the beginning.")
+    elif command == '?':
+        write(HELP_TEXT)
+    elif command == 'p':
+        legal = rank_directions(maze, history.get_position())
+        i = ", ".join(legal)
+        write("Possible directions: "+ i)
+    elif command == 'solve':
+        route = solve(maze, history.get_position())
+        if route is None:
+            write(NO_SOLUTION_TEXT.format(POKEMON[GOOD_POKEMON]))
+        else:
+            write(SOLVE_TEXT.format(POKEMON[GOOD_POKEMON], ", ".join(route)))
+    elif command == 'q':
+        var = ask("Are you sure you want to quit? [y] or n: ")
+        if var != 'n':
+            return GAME_QUIT
+    else:
+        write("Invalid command: " + command)
+    return None
+
+def interact(viewport=None):
     # Add your code for interact here
     """
     handles user input
-    interact() -> None
+    if viewport is a (rows, columns) pair, only that much of the maze around
+    the player is drawn each turn, instead of the whole maze.
+    interact((int, int)) -> None
     """
-    maze = load_maze(input("Maze File: "))
-    history = [START_POSITION]
+    filename = input("Maze File: ")
+    maze = load_cached_maze(filename)
+    history = MoveHistory()
+    if viewport is None:
+        renderer = None
+        write = print
+    else:
+        renderer = ViewportRenderer(maze, *viewport)
+        write = renderer.write
     
     while maze != None:
-        print()
-        print_maze(maze,history[-1])
-        print()
-        command = input("Command: ").strip().lower()
-        if command in DIRECTIONS:
-            position, direction = move(maze, history[-1], command)
-            if direction == '#':
-                print ("You can't go in that direction.")
-            elif direction in BAD_POKEMON:
-                print(LOSE_TEXT.format(POKEMON[direction]))
-                break
-            elif direction == GOOD_POKEMON:
-                print(WIN_TEXT.format(POKEMON[direction]))
-                break
-            elif direction == ' ':
-                history.append(position)
-        elif command == 'r':
-            history = [START_POSITION]
-        elif command =='b':
-            if len(history) > 1:
-                history.pop()
-            else:
-                print("You cannot go back from the beginning.")
-        elif command == '?':
-            print(HELP_TEXT)
-        elif command == 'p':
-            legal = get_legal_directions(maze, history[-1])
-            i = ", ".join(legal)
-            print("Possible directions: "+ i)
-        elif command == 'q':
-            var = input("Are you sure you want to quit? [y] or n: ")
-            if var == 'n':
-                continue
-            else:
-                break
+        if renderer is None:
+            print()
+            print_maze(maze,history.get_position())
+            print()
         else:
-            print("Invalid command: " + command)
+            renderer.draw(history.get_position())
+        command = input("Command: ").strip().lower()
+        if play_command(maze, history, command, input, write) is not None:
+            break
+    # Keep any tables built for hints or solving for the next game
+    update_cache(maze, filename)
            
 
 # End of support code
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Vectorised analysis of a1 mazes with NumPy.
+
+A maze is converted once into a two-dimensional array of square characters
+(as byte values), and every statistic is computed with whole-array
+operations: breadth-first searches advance their whole frontier at once,
+as an array of flat square indices, so there is no Python loop over
+individual squares except along narrow corridors.
+
+Run this file with maze files as arguments to print their statistics as
+JSON lines.
+"""
+
+import json
+import sys
+
+import numpy as np
+
+from a1_support import *
+
+
+def maze_to_array(maze):
+    """
+    Returns the squares of maze as a (rows, columns) array of byte values,
+    without the newlines.
+
+    maze_to_array(str|Maze) -> numpy.ndarray
+    """
+    text = maze if isinstance(maze, str) else str(maze)
+    rows, columns = maze_rows(text), maze_columns(text)
+
+    squares = np.frombuffer(text.encode('ascii') + b'\n', dtype=np.uint8)
+    return squares.reshape(rows, columns + 1)[:, :columns]
+
+
+def _squares_matching(squares, letters):
+    """
+    Returns a boolean array, True where a square is one of letters.
+
+    _squares_matching(numpy.ndarray, str) -> numpy.ndarray
+    """
+    return np.isin(squares, np.frombuffer(letters.encode('ascii'),
+                                          dtype=np.uint8))
+
+
+# Frontiers smaller than this are advanced square by square, where NumPy's
+# per-call overhead would outweigh the work
+_SMALL_FRONTIER = 32
+
+
+def distance_map(squares, start=START_POSITION, blocked=WALL):
+    """
+    Returns the number of moves needed to reach each square from start,
+    never entering a square in blocked, or -1 where a square is unreachable.
+
+    The search works on flat indices into the maze padded with a blocked
+    border, so the neighbours of a whole frontier are found by adding the
+    four direction offsets to its indices. Each square joins a frontier at
+    most once, so the total work is proportional to the number of squares.
+
+    distance_map(numpy.ndarray, (int, int), str) -> numpy.ndarray
+    """
+    rows, columns = squares.shape
+    width = columns + 2
+    padded = np.zeros((rows + 2, width), dtype=bool)
+    padded[1:-1, 1:-1] = ~_squares_matching(squares, blocked)
+    unseen = padded.ravel()
+    distances = np.full(unseen.size, -1, dtype=np.int32)
+
+    row, column = start
+    index = (row + 1) * width + column + 1
+    if 0 <= row < rows and 0 <= column < columns and unseen[index]:
+        offsets = np.array([-width, width, -1, 1])
+        # Where each neighbour was first found, to drop repeats
+        first = np.empty(unseen.size, dtype=np.intp)
+        unseen[index] = False
+        frontier = np.array([index])
+        distance = 0
+        while frontier.size:
+            distances[frontier] = distance
+            distance += 1
+            if frontier.size < _SMALL_FRONTIER:
+                found = []
+                for index in frontier.tolist():
+                    for offset in (-width, width, -1, 1):
+                        if unseen[index + offset]:
+                            unseen[index + offset] = False
+                            found.append(index + offset)
+                frontier = np.array(found, dtype=np.intp)
+            else:
+                found = (frontier[:, None] + offsets).ravel()
+                found = found[unseen[found]]
+                order = np.arange(found.size)
+                first[found] = order
+                frontier = found[first[found] == order]
+                unseen[frontier] = False
+
+    return distances.reshape(rows + 2, width)[1:-1, 1:-1]
+
+
+def reachable_region(squares, start=START_POSITION):
+    """
+    Returns a boolean array, True for each square reachable from start.
+
+    reachable_region(numpy.ndarray, (int, int)) -> numpy.ndarray
+    """
+    return distance_map(squares, start) >= 0
+
+
+def count_dead_ends(squares):
+    """
+    Returns the number of open squares with exactly one open neighbour.
+
+    count_dead_ends(numpy.ndarray) -> int
+    """
+    passable = ~_squares_matching(squares, WALL)
+    padded = np.pad(passable, 1).astype(np.uint8)
+    exits = (padded[:-2, 1:-1] + padded[2:, 1:-1]
+             + padded[1:-1, :-2] + padded[1:-1, 2:])
+    return int(np.count_nonzero(passable & (exits == 1)))
+
+
+def safe_distance(squares, start=START_POSITION):
+    """
+    Returns the fewest moves from start to the GOOD_POKEMON without touching
+    any BAD_POKEMON, or None if it cannot be reached.
+
+    safe_distance(numpy.ndarray, (int, int)) -> int
+    """
+    distances = distance_map(squares, start, WALL + BAD_POKEMON)
+    found = distances[_squares_matching(squares, GOOD_POKEMON)]
+    found = found[found >= 0]
+    return int(found.min()) if found.size else None
+
+
+def analyse_maze(maze):
+    """
+    Returns a dictionary of statistics about maze: its size, the number of
+    squares reachable from START_POSITION and the furthest of them, the
+    number of dead ends, and whether (and in how many moves) the
+    GOOD_POKEMON can be reached without touching a BAD_POKEMON.
+
+    analyse_maze(str|Maze) -> dict(str: *)
+    """
+    squares = maze_to_array(maze)
+    distances = distance_map(squares)
+    reachable = distances >= 0
+    pikachu_distance = safe_distance(squares)
+
+    return {
+        'rows': squares.shape[0],
+        'columns': squares.shape[1],
+        'reachable': int(np.count_nonzero(reachable)),
+        'furthest': int(distances.max()),
+        'dead_ends': count_dead_ends(squares),
+        'solvable': pikachu_distance is not None,
+        'solution_length': pikachu_distance,
+    }
+
+
+def main():
+    for filename in sys.argv[1:]:
+        stats = analyse_maze(load_maze(filename))
+        stats['file'] = filename
+        print(json.dumps(stats))
+
+
+if __name__ == '__main__':
+    main()
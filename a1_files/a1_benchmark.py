@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the a1 maze engine.
+
+Run this file directly to compare get_legal_directions queries per second on
+a maze string against a parsed Maze (which uses its legal direction table),
+for the bundled mazes and a synthetic 4096x4096 maze.
+
+With --search, it instead compares the route searches of a1_solver by the
+squares they expand and the time they take, on the bundled mazes and on
+generated mazes with open areas.
+
+With --suite, it times each of the index helpers and movement functions
+(position_to_index, index_to_position, maze_columns,
+get_position_in_direction, move and get_legal_directions) on synthetic
+square mazes of each size given, after warm-up runs, keeping the best and
+median of several repeats. The random positions and directions are seeded,
+so runs are reproducible, and --output writes the results as JSON for
+tracking regressions between versions.
+"""
+
+import argparse
+import collections
+import io
+import itertools
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+from a1 import *
+from a1_generate import generate_maze
+from a1_solver import SEARCHES, search
+
+BUNDLED_MAZES = ['maze1.txt', 'maze2.txt', 'maze3.txt', 'maze4.txt']
+SYNTHETIC_SIZE = 4096
+QUERIES = 200000
+
+SEARCH_MAZE_SIZES = [64, 256, 1024]
+
+SUITE_SIZES = [16, 256, 4096]
+SUITE_CALLS = 100000
+SUITE_REPEATS = 5
+SUITE_WARMUP = 1
+
+RESULT_FORMAT = "{:<16} {:>12,.0f} {:>12,.0f} {:>8.1f}x"
+SEARCH_HEADER_FORMAT = "{:<20} {:<14} {:>7} {:>12} {:>12} {:>10}"
+SEARCH_RESULT_FORMAT = "{:<20} {:<14} {:>7} {:>12,} {:>12,} {:>9.2f}ms"
+SUITE_HEADER_FORMAT = "{:<26} {:<5} {:>6} {:>14} {:>12}"
+SUITE_RESULT_FORMAT = "{:<26} {:<5} {:>6} {:>14,.0f} {:>10.1f}ns"
+
+
+def synthetic_maze(rows, columns, seed=0, wall_density=0.3):
+    """
+    Returns a random maze string with a solid outer wall, where each inner
+    square is a wall with probability wall_density.
+
+    synthetic_maze(int, int, int, float) -> str
+    """
+    generator = random.Random(seed)
+    threshold = int(wall_density * 256)
+    squares = bytes(ord(WALL) if i < threshold else ord(OPEN)
+                    for i in range(256))
+
+    border = WALL * columns
+    lines = [border]
+    for row in range(rows - 2):
+        inner = generator.randbytes(columns - 2).translate(squares)
+        lines.append(WALL + inner.decode('ascii') + WALL)
+    lines.append(border)
+    maze = '\n'.join(lines)
+
+    start = position_to_index(START_POSITION, columns)
+    return maze[:start] + OPEN + maze[start + 1:]
+
+
+def open_room_maze(rows, columns, seed=0, wall_density=0.02):
+    """
+    Returns a random maze string that is one large room with a scattering
+    of single walls (see synthetic_maze), with the GOOD_POKEMON in the
+    corner furthest from START_POSITION.
+
+    open_room_maze(int, int, int, float) -> str
+    """
+    maze = synthetic_maze(rows, columns, seed, wall_density)
+    goal = position_to_index((rows - 2, columns - 2), columns)
+    return maze[:goal] + GOOD_POKEMON + maze[goal + 1:]
+
+
+def generated_maze(rows, columns, seed=0, loop_density=1.0):
+    """
+    Returns a maze string made by a1_generate.generate_maze, with no
+    BAD_POKEMON and a fraction loop_density of its walls knocked through.
+
+    generated_maze(int, int, int, float) -> str
+    """
+    file = io.StringIO()
+    generate_maze(file, rows, columns, seed, pokemon_density=0.0,
+                  loop_density=loop_density)
+    return file.getvalue()
+
+
+def open_positions(maze, count, seed=0):
+    """
+    Returns count randomly chosen positions of open squares in maze.
+
+    open_positions(str, int, int) -> list((int, int))
+    """
+    generator = random.Random(seed)
+    columns = maze_columns(maze)
+    positions = []
+    while len(positions) < count:
+        index = generator.randrange(len(maze))
+        if maze[index] not in WALL + '\n':
+            positions.append(index_to_position(index, columns))
+    return positions
+
+
+def queries_per_second(maze, positions):
+    """
+    Returns the number of get_legal_directions queries per second made on
+    maze for each of positions.
+
+    queries_per_second(str|Maze, list((int, int))) -> float
+    """
+    start = time.perf_counter()
+    for position in positions:
+        get_legal_directions(maze, position)
+    return len(positions) / (time.perf_counter() - start)
+
+
+def benchmark_legal_directions(name, text, queries=QUERIES):
+    """
+    Prints queries per second for a maze string and a parsed Maze.
+
+    benchmark_legal_directions(str, str, int) -> None
+    """
+    positions = open_positions(text, queries)
+    maze = Maze(text)
+    maze.get_legal_mask(0)  # Build the table before timing
+
+    text_rate = queries_per_second(text, positions)
+    maze_rate = queries_per_second(maze, positions)
+    print(RESULT_FORMAT.format(name, text_rate, maze_rate,
+                               maze_rate / text_rate))
+
+
+def benchmark_searches(name, text):
+    """
+    Prints the route length found by each search in a1_solver.SEARCHES from
+    START_POSITION, with the squares it expanded and scanned and the time
+    it took.
+
+    benchmark_searches(str, str) -> None
+    """
+    maze = Maze(text)
+    maze.get_legal_table()  # Shared by every search, so built before timing
+    for method in SEARCHES:
+        start = time.perf_counter()
+        route, expanded, scanned = search(maze, START_POSITION, method)
+        milliseconds = (time.perf_counter() - start) * 1000
+        length = '-' if route is None else len(route)
+        print(SEARCH_RESULT_FORMAT.format(name, method, length, expanded,
+                                          scanned, milliseconds))
+
+
+def suite_cases(text, calls, seed=0):
+    """
+    Returns the operations timed by the suite on text, a maze string, as
+    (operation, maze kind, function, arguments) tuples, where arguments is
+    a list of calls worth of argument tuples. Operations taking a maze are
+    timed on both the maze string ('str') and a parsed Maze ('Maze').
+
+    suite_cases(str, int, int) -> list((str, str, func, list(tuple)))
+    """
+    generator = random.Random(seed)
+    maze = Maze(text)
+    maze.get_legal_table()  # Built once per Maze, so not timed
+    columns = maze_columns(text)
+
+    positions = open_positions(text, calls, seed)
+    directions = [generator.choice(DIRECTIONS) for position in positions]
+    indices = [position_to_index(position, columns)
+               for position in positions]
+
+    cases = [
+        ('position_to_index', None, position_to_index,
+         [(position, columns) for position in positions]),
+        ('index_to_position', None, index_to_position,
+         [(index, columns) for index in indices]),
+        ('get_position_in_direction', None, get_position_in_direction,
+         list(zip(positions, directions))),
+    ]
+    for kind, subject in (('str', text), ('Maze', maze)):
+        cases.append(('maze_columns', kind, maze_columns,
+                      [(subject,)] * calls))
+        cases.append(('move', kind, move,
+                      [(subject, position, direction) for position, direction
+                       in zip(positions, directions)]))
+        cases.append(('get_legal_directions', kind, get_legal_directions,
+                      [(subject, position) for position in positions]))
+    return cases
+
+
+def time_calls(function, arguments, repeats=SUITE_REPEATS,
+               warmup=SUITE_WARMUP):
+    """
+    Calls function with each tuple in arguments, warmup times untimed and
+    then repeats times timed, returning the seconds each timed run took.
+
+    time_calls(func, list(tuple), int, int) -> list(float)
+    """
+    def run():
+        # Consumes the calls at C speed, keeping no results
+        collections.deque(itertools.starmap(function, arguments), maxlen=0)
+
+    for attempt in range(warmup):
+        run()
+    times = []
+    for attempt in range(repeats):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run_suite(sizes=SUITE_SIZES, calls=SUITE_CALLS, repeats=SUITE_REPEATS,
+              warmup=SUITE_WARMUP, seed=0, report=None):
+    """
+    Times every suite operation (see suite_cases) on a synthetic square
+    maze of each of sizes, calling report with each result as it is made.
+
+    Returns a dictionary describing the run, with a list of results giving
+    the operation, maze kind, size, calls, and the best and median seconds
+    and calls per second of the repeats.
+
+    run_suite(list(int), int, int, int, int, func) -> dict(str: *)
+    """
+    results = []
+    for size in sizes:
+        text = synthetic_maze(size, size, seed)
+        for operation, kind, function, arguments in suite_cases(text, calls,
+                                                                seed):
+            times = time_calls(function, arguments, repeats, warmup)
+            best = min(times)
+            result = {
+                'operation': operation,
+                'maze': kind,
+                'size': size,
+                'calls': calls,
+                'best_seconds': best,
+                'median_seconds': statistics.median(times),
+                'calls_per_second': calls / best,
+                'best_ns_per_call': best / calls * 1e9,
+            }
+            results.append(result)
+            if report is not None:
+                report(result)
+
+    return {
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'seed': seed,
+        'repeats': repeats,
+        'warmup': warmup,
+        'results': results,
+    }
+
+
+def main_suite(args):
+    print(SUITE_HEADER_FORMAT.format("operation", "maze", "size",
+                                     "calls/s", "per call"))
+
+    def report(result):
+        print(SUITE_RESULT_FORMAT.format(
+            result['operation'], result['maze'] or '-', result['size'],
+            result['calls_per_second'], result['best_ns_per_call']),
+            flush=True)
+
+    run = run_suite(args.sizes, args.calls, args.repeats, args.warmup,
+                    args.seed, report)
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(run, file, indent=2)
+            file.write('\n')
+
+
+def main_search():
+    print(SEARCH_HEADER_FORMAT.format("maze", "search", "length",
+                                      "expanded", "scanned", "time"))
+    for filename in BUNDLED_MAZES:
+        benchmark_searches(filename, load_maze(filename))
+    for size in SEARCH_MAZE_SIZES:
+        benchmark_searches("room {0}x{0}".format(size),
+                           open_room_maze(size, size))
+        benchmark_searches("loops {0}x{0}".format(size),
+                           generated_maze(size + 1, size + 1))
+
+
+def main_legal_directions():
+    print("{:<16} {:>12} {:>12} {:>9}".format("maze", "str q/s",
+                                              "Maze q/s", "speedup"))
+    for filename in BUNDLED_MAZES:
+        benchmark_legal_directions(filename, load_maze(filename))
+
+    size = SYNTHETIC_SIZE
+    benchmark_legal_directions("{0}x{0}".format(size),
+                               synthetic_maze(size, size))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the a1 maze engine.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--search', action='store_true',
+                      help="compare route searches instead of legal "
+                           "direction queries")
+    mode.add_argument('--suite', action='store_true',
+                      help="time the index helpers and movement functions")
+    suite = parser.add_argument_group("suite options")
+    suite.add_argument('--sizes', type=int, nargs='+', default=SUITE_SIZES,
+                       help="maze sizes (rows and columns) to time on")
+    suite.add_argument('--calls', type=int, default=SUITE_CALLS,
+                       help="calls per timed run")
+    suite.add_argument('--repeats', type=int, default=SUITE_REPEATS,
+                       help="timed runs of each operation")
+    suite.add_argument('--warmup', type=int, default=SUITE_WARMUP,
+                       help="untimed runs before timing")
+    suite.add_argument('--seed', type=int, default=0,
+                       help="seed for the mazes, positions and directions")
+    suite.add_argument('--output', default=None,
+                       help="file to write the results to as JSON")
+    args = parser.parse_args()
+
+    if args.search:
+        main_search()
+    elif args.suite:
+        main_suite(args)
+    else:
+        main_legal_directions()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,286 @@
+"""
+On-disk cache of parsed a1 mazes.
+
+The first time a maze file is loaded with load_cached_maze, its parsed form
+(dimensions, wall flags, Pokemon squares and legal direction table) is
+written to a cache file next to it. Later loads memory-map the cache instead
+of reading and parsing the maze text. Tables computed while the maze is in
+use (such as hint distances) are added to the cache by update_cache. A
+cache records the size and modification time of the maze file it was made
+from, and is rebuilt whenever either changes.
+
+Cache file layout (little-endian, every section padded to 8 bytes):
+    header (see _HEADER)
+    wall flags             length bytes
+    legal direction masks  length bytes
+    Pokemon indices        pokemon_count unsigned 64-bit integers
+    Pokemon letters        pokemon_count unsigned 32-bit code points
+    each table: name length (H), name and array count (B), then for
+        each array: typecode (c) and item count (Q), then its items
+"""
+
+from array import array
+import mmap
+import os
+import struct
+
+from a1_support import *
+
+CACHE_SUFFIX = '.a1cache'
+
+_MAGIC = b'A1MAZE'
+_VERSION = 2
+# magic, version, source size, source mtime (ns), rows, columns, length,
+# number of Pokemon, number of tables
+_HEADER = struct.Struct('<6sHQQQQQQI')
+_TABLE_NAME = struct.Struct('<H')
+_TABLE_ARRAYS = struct.Struct('<B')
+_ARRAY_HEADER = struct.Struct('<cQ')
+_ALIGNMENT = 8
+# Translation from an open flag (see Maze._open_flags) to a wall flag
+_OPEN_FLAG_WALLS = bytes([1, 0]) + bytes(254)
+
+
+def cache_filename(filename):
+    """
+    Returns the name of the cache file for the maze file called filename.
+
+    cache_filename(str) -> str
+    """
+    return filename + CACHE_SUFFIX
+
+
+def _padding(offset):
+    """
+    Returns the bytes needed after offset to reach a multiple of _ALIGNMENT.
+
+    _padding(int) -> bytes
+    """
+    return bytes(-offset % _ALIGNMENT)
+
+
+def _table_arrays(table):
+    """
+    Returns the arrays making up table (an array or memoryview, or tuple of
+    them), or None if it cannot be cached.
+
+    _table_arrays(*) -> list(array)
+    """
+    arrays = list(table) if isinstance(table, tuple) else [table]
+    if all(isinstance(item, (array, memoryview)) for item in arrays):
+        return arrays
+    return None
+
+
+def _cacheable_tables(maze):
+    """
+    Returns the (name, arrays) pair of each table maze has computed so far
+    that can be cached.
+
+    _cacheable_tables(Maze) -> list((str, list(array)))
+    """
+    tables = []
+    for name, table in maze._tables.items():
+        arrays = _table_arrays(table)
+        if arrays is not None:
+            tables.append((name, arrays))
+    return tables
+
+
+def _wall_flags(maze):
+    """
+    Returns the wall flags of maze, as kept by Maze, for any kind of maze.
+    A RaggedMaze is flagged as its equivalent rectangular maze.
+
+    _wall_flags(Maze) -> bytes
+    """
+    if type(maze) in (Maze, CachedMaze):
+        return maze._walls
+    columns = maze.get_columns()
+    flags = bytearray(maze._open_flags().translate(_OPEN_FLAG_WALLS))
+    flags[columns::columns + 1] = bytes([2]) * (maze.get_rows() - 1)
+    return flags
+
+
+def write_cache(maze, filename, source=None):
+    """
+    Writes the cache for maze, parsed from the maze file called filename,
+    including every table maze has computed so far that can be cached.
+    source is the (size, modification time in ns) of the maze file when it
+    was read, by default its current size and time.
+
+    write_cache(Maze, str, (int, int)) -> None
+    """
+    if source is None:
+        stat = os.stat(filename)
+        source = (stat.st_size, stat.st_mtime_ns)
+    pokemon = sorted(maze.get_pokemon().items())
+    tables = _cacheable_tables(maze)
+
+    temporary = cache_filename(filename) + '.tmp'
+    with open(temporary, 'wb') as file:
+        def write(data):
+            file.write(data)
+            file.write(_padding(file.tell()))
+
+        write(_HEADER.pack(_MAGIC, _VERSION, source[0], source[1],
+                           maze.get_rows(), maze.get_columns(), len(maze),
+                           len(pokemon), len(tables)))
+        write(_wall_flags(maze))
+        write(maze.get_legal_table())
+        write(array('Q', [index for index, letter in pokemon]))
+        write(array('I', [ord(letter) for index, letter in pokemon]))
+
+        for name, arrays in tables:
+            encoded = name.encode('utf-8')
+            write(_TABLE_NAME.pack(len(encoded)) + encoded
+                  + _TABLE_ARRAYS.pack(len(arrays)))
+            for item in arrays:
+                typecode = item.typecode if isinstance(item, array) \
+                    else item.format
+                write(_ARRAY_HEADER.pack(typecode.encode('ascii'),
+                                         len(item)))
+                write(item)
+
+    os.replace(temporary, cache_filename(filename))
+
+
+class CachedMaze(Maze):
+    """
+    A Maze loaded from a cache file, with its wall flags and tables read
+    straight from a memory mapping of the cache.
+    """
+
+    def __init__(self, filename):
+        """
+        Maps the cache file called filename. Raises ValueError if it is not
+        a valid cache file.
+
+        CachedMaze(str) -> CachedMaze
+        """
+        with open(filename, 'rb') as file:
+            self._buffer = mmap.mmap(file.fileno(), 0,
+                                     access=mmap.ACCESS_READ)
+        try:
+            self._read_sections()
+        except (struct.error, TypeError, ValueError, OverflowError):
+            pass
+        else:
+            return
+        # Closed outside the except clause, whose traceback still holds
+        # views of the mapping
+        self.close()
+        raise ValueError("{} is not a valid maze cache".format(filename))
+
+    def _read_sections(self):
+        """
+        Reads the maze and its tables from the mapped cache file. Raises
+        ValueError if the file is not a cache or a section of it runs past
+        its end, and struct.error, TypeError or OverflowError if a header or
+        Pokemon letter is corrupt.
+
+        _read_sections() -> None
+        """
+        view = memoryview(self._buffer)
+        offset = 0
+
+        def read(size):
+            nonlocal offset
+            if offset + size > len(view):
+                raise ValueError("Maze cache is truncated")
+            data = view[offset:offset + size]
+            offset += size + len(_padding(offset + size))
+            return data
+
+        (magic, version, self.source_size, self.source_mtime_ns,
+         self._rows, self._columns, length, pokemon_count,
+         table_count) = _HEADER.unpack(read(_HEADER.size))
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not a maze cache")
+        if length != self._rows * (self._columns + 1) - 1:
+            raise ValueError("Maze cache has the wrong length")
+
+        self._walls = read(length)
+        self._legal = read(length)
+        indices = read(pokemon_count * 8).cast('Q')
+        letters = read(pokemon_count * 4).cast('I')
+        self._pokemon = dict(zip(indices, map(chr, letters)))
+        self._pokemon_order = None
+
+        self._tables = {}
+        for table in range(table_count):
+            name_length, = _TABLE_NAME.unpack_from(view, offset)
+            entry = read(_TABLE_NAME.size + name_length + _TABLE_ARRAYS.size)
+            name = bytes(entry[_TABLE_NAME.size:-_TABLE_ARRAYS.size])
+            name = name.decode('utf-8')
+            array_count, = _TABLE_ARRAYS.unpack(entry[-_TABLE_ARRAYS.size:])
+            arrays = []
+            for item in range(array_count):
+                typecode, count = _ARRAY_HEADER.unpack(
+                    read(_ARRAY_HEADER.size))
+                typecode = typecode.decode('ascii')
+                size = count * array(typecode).itemsize
+                arrays.append(read(size).cast(typecode))
+            self._tables[name] = arrays[0] if array_count == 1 \
+                else tuple(arrays)
+        self.cached_tables = frozenset(self._tables)
+
+    def close(self):
+        """
+        Releases the memory mapping of the cache file. Tables previously
+        returned by this CachedMaze must no longer be in use.
+
+        close() -> None
+        """
+        self._walls = self._legal = self._pokemon = None
+        self._tables = {}
+        self._buffer.close()
+
+
+def load_cached_maze(filename):
+    """
+    Loads the maze in the file called filename, from its cache if it is up
+    to date, otherwise by parsing it (see load_parsed_maze) and writing a
+    new cache. The maze is returned as a CachedMaze unless the cache cannot
+    be written.
+
+    load_cached_maze(str) -> Maze
+    """
+    stat = os.stat(filename)
+    source = (stat.st_size, stat.st_mtime_ns)
+    try:
+        maze = CachedMaze(cache_filename(filename))
+    except (OSError, ValueError):
+        pass
+    else:
+        if (maze.source_size, maze.source_mtime_ns) == source:
+            return maze
+        maze.close()
+
+    maze = load_parsed_maze(filename)
+    maze.get_legal_table()
+    try:
+        write_cache(maze, filename, source)
+        return CachedMaze(cache_filename(filename))
+    except (OSError, ValueError):
+        return maze
+
+
+def update_cache(maze, filename):
+    """
+    Adds the tables computed by maze, a CachedMaze loaded for the maze file
+    called filename, to its cache file if they are not already there. Other
+    mazes and unwritable caches are left alone.
+
+    update_cache(Maze, str) -> None
+    """
+    if not isinstance(maze, CachedMaze):
+        return
+    names = {name for name, arrays in _cacheable_tables(maze)}
+    if names <= maze.cached_tables:
+        return
+    try:
+        write_cache(maze, filename,
+                    (maze.source_size, maze.source_mtime_ns))
+    except OSError:
+        pass
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Procedural generation of a1 maze files.
+
+Mazes are built with the sidewinder algorithm, which only ever needs the
+current row of cells, so each row is written to the file as soon as it is
+made and memory use depends only on the width of the maze. The cells of the
+maze are the squares at odd rows and columns, with START_POSITION at (1, 1);
+the squares between them are walls or passages.
+
+Usage: a1_generate.py filename rows columns [--seed N]
+                      [--pokemon-density D] [--loop-density D]
+"""
+
+import argparse
+import random
+
+from a1_support import *
+
+# Translation from a passage flag (1 = open) to its square
+_PASSAGES = (WALL + OPEN).encode('ascii') + bytes(254)
+
+
+def _threshold_table(density, letters):
+    """
+    Returns a translation table from random bytes to squares, mapping a
+    fraction density of byte values to letters (in turn) and the rest to
+    OPEN.
+
+    _threshold_table(float, str) -> bytes
+    """
+    threshold = round(density * 256)
+    letters = letters.encode('ascii')
+    return bytes(letters[value % len(letters)] if value < threshold
+                 else ord(OPEN) for value in range(256))
+
+
+def _row_passages(generator, row, cell_columns, loop_table):
+    """
+    Returns the (east, north) passage flags for the cells of row, where east
+    is 1 for each cell open to the east and north is 1 for each cell open to
+    the north.
+
+    _row_passages(random.Random, int, int, bytes) -> (bytearray, bytearray)
+    """
+    east = bytearray(cell_columns)
+    north = bytearray(cell_columns)
+    if row == 0:
+        east[:-1] = b'\x01' * (cell_columns - 1)
+        return east, north
+
+    closes = generator.randbytes(cell_columns)
+    run_start = 0
+    for column in range(cell_columns):
+        if column == cell_columns - 1 or closes[column] < 128:
+            north[generator.randint(run_start, column)] = 1
+            run_start = column + 1
+        else:
+            east[column] = 1
+
+    if loop_table is not None:
+        loops = generator.randbytes(cell_columns).translate(loop_table)
+        north = bytearray(a | b for a, b in zip(north, loops))
+    return east, north
+
+
+def generate_maze(file, rows, columns, seed=None, pokemon_density=0.03,
+                  loop_density=0.0):
+    """
+    Writes a random maze of rows by columns squares to file, a text file
+    opened for writing.
+
+    A fraction pokemon_density of the dead ends hold a BAD_POKEMON, and one
+    cell holds the GOOD_POKEMON. Only dead ends are used so that every
+    generated maze can be solved: a route never passes through a dead end.
+    With loop_density 0 there is exactly one route between any two cells;
+    otherwise that fraction of the walls between rows are also knocked
+    through, adding loops and open areas.
+
+    generate_maze(file, int, int, int, float, float) -> None
+    """
+    if rows < 3 or columns < 3:
+        raise ValueError("A maze needs at least 3 rows and 3 columns")
+
+    generator = random.Random(seed)
+    cell_rows = (rows - 1) // 2
+    cell_columns = (columns - 1) // 2
+    # Even sizes leave one extra row or column of wall
+    padding = WALL * (columns - 2 * cell_columns - 1)
+
+    goal_row = generator.randrange(cell_rows)
+    goal_column = generator.randrange(cell_columns)
+    if (goal_row, goal_column) == (0, 0) and cell_rows * cell_columns > 1:
+        goal_row, goal_column = (1, 0) if cell_rows > 1 else (0, 1)
+
+    pokemon_table = _threshold_table(pokemon_density, BAD_POKEMON)
+    loop_table = None
+    if loop_density:
+        loop_table = bytes(1 if value < round(loop_density * 256) else 0
+                           for value in range(256))
+    border = WALL * columns + '\n'
+    line = bytearray(WALL * (2 * cell_columns + 1), 'ascii')
+
+    file.write(border)
+    # The passages of the next row are made one row early, as they decide
+    # which cells of this row are dead ends
+    east, north = _row_passages(generator, 0, cell_columns, loop_table)
+    for row in range(cell_rows):
+        if row + 1 < cell_rows:
+            below = _row_passages(generator, row + 1, cell_columns,
+                                  loop_table)
+        else:
+            below = (bytearray(cell_columns), bytearray(cell_columns))
+
+        if row:
+            line[1::2] = north.translate(_PASSAGES)
+            line[2::2] = WALL.encode('ascii') * cell_columns
+            file.write(line.decode('ascii') + padding + '\n')
+
+        cells = bytearray(generator.randbytes(cell_columns)
+                          .translate(pokemon_table))
+        south = below[1]
+        for column in range(cell_columns):
+            exits = (east[column] + north[column] + south[column]
+                     + (column > 0 and east[column - 1]))
+            if exits != 1:
+                cells[column] = ord(OPEN)
+        if row == 0:
+            cells[0] = ord(OPEN)
+        if row == goal_row:
+            cells[goal_column] = ord(GOOD_POKEMON)
+        line[1::2] = cells
+        line[2::2] = east.translate(_PASSAGES)
+        file.write(line.decode('ascii') + padding + '\n')
+        east, north = below
+
+    if rows - 2 * cell_rows - 1:
+        file.write(border)
+    file.write(border.rstrip('\n'))
+
+
+def write_maze(filename, rows, columns, **options):
+    """
+    Writes a random maze of rows by columns squares to the file called
+    filename. See generate_maze for the options.
+
+    write_maze(str, int, int, ...) -> None
+    """
+    with open(filename, 'w', buffering=1 << 20) as file:
+        generate_maze(file, rows, columns, **options)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate a random a1 maze file.")
+    parser.add_argument('filename')
+    parser.add_argument('rows', type=int)
+    parser.add_argument('columns', type=int)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--pokemon-density', type=float, default=0.03,
+                        help="fraction of dead ends holding a bad Pokemon")
+    parser.add_argument('--loop-density', type=float, default=0.0,
+                        help="fraction of extra walls knocked through")
+    args = parser.parse_args()
+
+    write_maze(args.filename, args.rows, args.columns, seed=args.seed,
+               pokemon_density=args.pokemon_density,
+               loop_density=args.loop_density)
+
+
+if __name__ == '__main__':
+    main()
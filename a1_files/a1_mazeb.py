@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+The .mazeb binary maze format.
+
+A .mazeb file holds a maze in about an eighth of the space of its text: a
+fixed header, a plane with one bit per square (1 for a wall) and a sparse
+list of the squares holding a Pokemon (or any other letter). Conversion to
+and from the a1 text format is lossless for rectangular mazes.
+
+File layout (little-endian):
+    header (see _HEADER)
+    wall plane       ceil(rows * columns / 8) bytes; square number n
+                     (row * columns + column) is bit n % 8 of byte n // 8
+    Pokemon squares  pokemon_count unsigned 64-bit square numbers
+    Pokemon letters  pokemon_count bytes
+
+Usage: a1_mazeb.py source destination
+    Converts a text maze to .mazeb, or a .mazeb file (by its extension) back
+    to text.
+"""
+
+from array import array
+import bisect
+import re
+import struct
+import sys
+
+from a1_support import *
+
+MAZEB_SUFFIX = '.mazeb'
+
+_MAGIC = b'MAZEB\x00'
+_VERSION = 1
+# magic, version, rows, columns, number of Pokemon
+_HEADER = struct.Struct('<6sHQQQ')
+
+# Translation tables: text to wall bits, each bit value to its place in a
+# byte, each bit of a byte to 0 or 1, and 0/1 back to squares
+_TEXT_BITS = bytearray(256)
+_TEXT_BITS[ord(WALL)] = 1
+_BIT_PLACES = [bytes([0, 1 << bit]) + bytes(254) for bit in range(8)]
+_BIT_VALUES = [bytes((value >> bit) & 1 for value in range(256))
+               for bit in range(8)]
+_BIT_SQUARES = (OPEN + WALL).encode('ascii') + bytes(254)
+_BIT_OPEN = bytes([1, 0]) + bytes(254)
+
+
+def _pack_bits(flags):
+    """
+    Returns flags (one 0 or 1 byte per square) packed eight to a byte.
+
+    _pack_bits(bytes) -> bytes
+    """
+    flags = bytes(flags) + bytes(-len(flags) % 8)
+    packed = 0
+    for bit in range(8):
+        # No byte exceeds 255, so OR-ing whole integers ORs each byte
+        packed |= int.from_bytes(flags[bit::8].translate(_BIT_PLACES[bit]),
+                                 'little')
+    return packed.to_bytes(len(flags) // 8, 'little')
+
+
+def _unpack_bits(plane, first, count):
+    """
+    Returns count bits of plane starting at bit number first, one 0 or 1
+    byte per bit.
+
+    _unpack_bits(bytes, int, int) -> bytearray
+    """
+    chunk = plane[first >> 3:(first + count + 7) >> 3]
+    flags = bytearray(len(chunk) * 8)
+    for bit in range(8):
+        flags[bit::8] = chunk.translate(_BIT_VALUES[bit])
+    skip = first & 7
+    return flags[skip:skip + count]
+
+
+def text_to_mazeb(text):
+    """
+    Returns the .mazeb encoding of text, a rectangular maze string. Raises
+    ValueError if the rows are not all the same length.
+
+    text_to_mazeb(str) -> bytes
+    """
+    rows, columns = maze_rows(text), maze_columns(text)
+    if columns == -1:
+        columns = len(text)
+    if len(text) != rows * (columns + 1) - 1:
+        raise ValueError("the maze is not rectangular")
+
+    squares = text.replace('\n', '').encode('ascii')
+    if len(squares) != rows * columns:
+        raise ValueError("the maze is not rectangular")
+
+    pokemon = [(match.start(), match.group())
+               for match in re.finditer('[^# \n]', text)]
+    numbers = array('Q', [index - index // (columns + 1)
+                          for index, letter in pokemon])
+    letters = ''.join(letter for index, letter in pokemon)
+
+    return b''.join([
+        _HEADER.pack(_MAGIC, _VERSION, rows, columns, len(pokemon)),
+        _pack_bits(squares.translate(_TEXT_BITS)),
+        numbers.tobytes(),
+        letters.encode('ascii'),
+    ])
+
+
+class BinaryMaze(Maze):
+    """
+    A Maze read from .mazeb data, with walls looked up in the bit-packed
+    plane. Squares are indexed as in the equivalent maze string (see
+    position_to_index), so it can be used anywhere a Maze can.
+    """
+
+    def __init__(self, data):
+        """
+        Reads data, the contents of a .mazeb file. Raises ValueError if it
+        is not valid .mazeb data.
+
+        BinaryMaze(bytes) -> BinaryMaze
+        """
+        try:
+            magic, version, rows, columns, pokemon_count = \
+                _HEADER.unpack_from(data)
+        except struct.error:
+            raise ValueError("not .mazeb data")
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("not .mazeb data")
+
+        self._rows = rows
+        self._columns = columns
+        start = _HEADER.size
+        end = start + (rows * columns + 7) // 8
+        self._plane = data[start:end]
+
+        numbers = array('Q')
+        numbers.frombytes(data[end:end + 8 * pokemon_count])
+        letters = data[end + 8 * pokemon_count:
+                       end + 9 * pokemon_count].decode('ascii')
+        if len(numbers) != pokemon_count or len(letters) != pokemon_count:
+            raise ValueError(".mazeb data is truncated")
+        self._pokemon = {number + number // columns: letter
+                         for number, letter in zip(numbers, letters)}
+
+        self._pokemon_order = None
+        self._legal = None
+        self._tables = {}
+
+    def _square_number(self, index):
+        """
+        Returns the number of the square at index in the wall plane, or
+        None for the newline at the end of a row.
+
+        _square_number(int) -> int
+        """
+        row, column = divmod(index, self._columns + 1)
+        if column == self._columns:
+            return None
+        return row * self._columns + column
+
+    def is_wall(self, index):
+        """
+        Returns True iff the square at index cannot be entered.
+
+        is_wall(int) -> bool
+        """
+        number = self._square_number(index)
+        if number is None:
+            return True
+        return bool((self._plane[number >> 3] >> (number & 7)) & 1)
+
+    def get_legal_mask(self, index):
+        """
+        Returns the legal direction mask of the square at index (see
+        Maze.get_legal_mask), from the legal direction table if one has been
+        built, else straight from the wall plane.
+
+        get_legal_mask(int) -> int
+        """
+        if self._legal is not None:
+            return self._legal[index]
+        return self._find_legal_mask(index)
+
+    def _open_flags(self):
+        """
+        Returns a byte per index, 1 if the square can be entered, else 0.
+
+        _open_flags() -> bytes
+        """
+        columns = self._columns
+        stride = columns + 1
+        squares = _unpack_bits(self._plane, 0, self._rows * columns)
+        squares = squares.translate(_BIT_OPEN)
+
+        flags = bytearray(len(self))
+        for row in range(self._rows):
+            flags[row * stride:row * stride + columns] = \
+                squares[row * columns:(row + 1) * columns]
+        return bytes(flags)
+
+    def __getitem__(self, index):
+        """
+        Returns the character of the square at index, as in the maze string.
+
+        __getitem__(int) -> str
+        """
+        if self._square_number(index) is None:
+            return '\n'
+        if self.is_wall(index):
+            return WALL
+        return self._pokemon.get(index, OPEN)
+
+    def __len__(self):
+        """
+        Returns the length of the equivalent maze string.
+
+        __len__() -> int
+        """
+        return self._rows * (self._columns + 1) - 1
+
+    def __str__(self):
+        """
+        Returns the equivalent maze string.
+
+        __str__() -> str
+        """
+        return self.get_text(0, len(self))
+
+    def get_text(self, start, end):
+        """
+        Returns the part of the maze string from index start up to end.
+
+        get_text(int, int) -> str
+        """
+        if self._pokemon_order is None:
+            self._pokemon_order = sorted(self._pokemon)
+        order = self._pokemon_order
+        columns = self._columns
+        stride = columns + 1
+
+        pieces = []
+        index = max(start, 0)
+        end = min(end, len(self))
+        while index < end:
+            row, column = divmod(index, stride)
+            if column == columns:
+                pieces.append('\n')
+                index += 1
+                continue
+
+            stop = min(end, row * stride + columns)
+            squares = _unpack_bits(self._plane, row * columns + column,
+                                   stop - index).translate(_BIT_SQUARES)
+            for i in range(bisect.bisect_left(order, index),
+                           bisect.bisect_left(order, stop)):
+                squares[order[i] - index] = ord(self._pokemon[order[i]])
+            pieces.append(squares.decode('ascii'))
+            index = stop
+        return ''.join(pieces)
+
+
+def load_binary_maze(filename):
+    """
+    Loads the maze in the .mazeb file called filename.
+
+    load_binary_maze(str) -> BinaryMaze
+    """
+    with open(filename, 'rb') as file:
+        return BinaryMaze(file.read())
+
+
+def mazeb_to_text(data):
+    """
+    Returns the maze string encoded by data, the contents of a .mazeb file.
+
+    mazeb_to_text(bytes) -> str
+    """
+    return str(BinaryMaze(data))
+
+
+def convert_to_mazeb(text_filename, mazeb_filename):
+    """
+    Converts the text maze in the file called text_filename to a .mazeb file
+    called mazeb_filename.
+
+    convert_to_mazeb(str, str) -> None
+    """
+    data = text_to_mazeb(load_maze(text_filename))
+    with open(mazeb_filename, 'wb') as file:
+        file.write(data)
+
+
+def convert_to_text(mazeb_filename, text_filename):
+    """
+    Converts the .mazeb file called mazeb_filename to a text maze file
+    called text_filename.
+
+    convert_to_text(str, str) -> None
+    """
+    text = str(load_binary_maze(mazeb_filename))
+    with open(text_filename, 'w') as file:
+        file.write(text)
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: a1_mazeb.py source destination", file=sys.stderr)
+        sys.exit(2)
+
+    source, destination = sys.argv[1:]
+    if source.endswith(MAZEB_SUFFIX):
+        convert_to_text(source, destination)
+    else:
+        convert_to_mazeb(source, destination)
+
+
+if __name__ == '__main__':
+    main()
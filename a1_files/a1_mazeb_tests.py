@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Seeded round-trip checks for the .mazeb format.
+
+Random rectangular mazes, with walls, open squares and Pokemon letters, are
+converted to .mazeb and back, through a1_mazeb's functions and through
+files, and must come back unchanged. The BinaryMaze read from each must
+also agree with the parsed Maze on every square's walls and legal moves.
+
+Usage: a1_mazeb_tests.py [--seed N] [--count N]
+"""
+
+import os
+import sys
+import tempfile
+
+from a1_support import *
+from a1_mazeb import *
+from a1_test_support import *
+
+# Letters for Pokemon in random mazes, including some the game never uses
+LETTERS = BAD_POKEMON + 'XYZ'
+
+
+def check_maze(text, directory):
+    """
+    Returns a list of the problems found converting text, a maze string, to
+    .mazeb and back; an empty list means every check passed.
+
+    check_maze(str, str) -> list(str)
+    """
+    errors = []
+    data = text_to_mazeb(text)
+    if mazeb_to_text(data) != text:
+        errors.append("mazeb_to_text(text_to_mazeb(text)) differs")
+
+    binary = BinaryMaze(data)
+    parsed = Maze(text)
+    if (binary.get_rows(), binary.get_columns()) != \
+            (parsed.get_rows(), parsed.get_columns()):
+        errors.append("size differs")
+    elif any(binary.is_wall(index) != parsed.is_wall(index)
+             for index in range(len(parsed))):
+        errors.append("is_wall differs")
+    elif list(binary.get_legal_table()) != list(parsed.get_legal_table()):
+        errors.append("legal table differs")
+    elif binary.get_pokemon() != parsed.get_pokemon():
+        errors.append("Pokemon differ")
+
+    text_file = os.path.join(directory, 'maze.txt')
+    mazeb_file = os.path.join(directory, 'maze' + MAZEB_SUFFIX)
+    copy_file = os.path.join(directory, 'copy.txt')
+    with open(text_file, 'w') as file:
+        file.write(text)
+    convert_to_mazeb(text_file, mazeb_file)
+    convert_to_text(mazeb_file, copy_file)
+    if load_maze(copy_file) != text:
+        errors.append("file round trip differs")
+    return errors
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        return run_checks("Check .mazeb conversion on random mazes.",
+                          lambda text: check_maze(text, directory), 500,
+                          letters=LETTERS)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Pipe-driven interact sessions for programs playing a1 mazes.
+
+Commands are read from a pipe in large chunks rather than a line at a time,
+and everything written in reply is collected into one buffer that is flushed
+just before the next chunk is read. A program that sends a batch of commands
+gets all of their replies in a single write, instead of paying for a system
+call per prompt and message.
+
+Two protocols are supported. The text protocol writes exactly what interact
+would print after the maze file is chosen. The JSON lines protocol writes one
+JSON object per command, for bots:
+
+    {"command": "n", "messages": [], "position": [2, 1],
+     "legal": ["n", "s"], "outcome": null}
+
+where position and legal describe the square the player ended up on, and
+outcome is GAME_WON, GAME_LOST or GAME_QUIT if the command ended the game
+(the next command then starts a new game at START_POSITION). The answer to
+the quit question is read as the line after 'q'.
+
+Usage: a1_pipe.py maze_file [--json] [--chunk-size N]
+"""
+
+import argparse
+import json
+import sys
+
+from a1 import *
+
+# Bytes read from the pipe at once
+PIPE_CHUNK_SIZE = 1 << 16
+
+PROTOCOL_TEXT = 'text'
+PROTOCOL_JSON = 'json'
+
+
+def _read_lines(source, flush, chunk_size):
+    """
+    Yields the lines read from source (a binary file) in chunks of up to
+    chunk_size bytes, calling flush before every read that may block.
+
+    _read_lines(file, func, int) -> iter(str)
+    """
+    read = getattr(source, 'read1', source.read)
+    pending = b''
+    while True:
+        flush()
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line.decode('utf-8', 'replace')
+    if pending:
+        yield pending.decode('utf-8', 'replace')
+
+
+def serve(maze, source, sink, protocol=PROTOCOL_TEXT,
+          chunk_size=PIPE_CHUNK_SIZE):
+    """
+    Plays maze with the commands read from source (a binary file such as a
+    pipe), writing replies to sink (a binary file) in the given protocol,
+    PROTOCOL_TEXT or PROTOCOL_JSON, until source is exhausted.
+
+    serve(str|Maze, file, file, str, int) -> None
+    """
+    pieces = []
+    columns = maze_columns(maze)
+    json_lines = protocol == PROTOCOL_JSON
+
+    def flush():
+        if pieces:
+            sink.write(''.join(pieces).encode('utf-8'))
+            sink.flush()
+            pieces.clear()
+
+    lines = _read_lines(source, flush, chunk_size)
+    messages = []
+
+    if json_lines:
+        write = messages.append
+    else:
+        def write(message):
+            pieces.append(message)
+            pieces.append('\n')
+
+    def ask(prompt):
+        if not json_lines:
+            pieces.append(prompt)
+        return next(lines, '').rstrip('\r')
+
+    def draw(position):
+        index = position_to_index(position, columns)
+        pieces.append('\n')
+        if isinstance(maze, str):
+            pieces.extend((maze[:index], PLAYER, maze[index + 1:]))
+        else:
+            pieces.extend(maze.iter_text(index))
+        pieces.append('\n\nCommand: ')
+
+    history = MoveHistory()
+    if not json_lines:
+        draw(history.get_position())
+    for line in lines:
+        command = line.strip().lower()
+        outcome = play_command(maze, history, command, ask, write)
+        position = history.get_position()
+
+        if json_lines:
+            pieces.append(json.dumps({
+                'command': command,
+                'messages': messages,
+                'position': position,
+                'legal': get_legal_directions(maze, position),
+                'outcome': outcome,
+            }))
+            pieces.append('\n')
+            messages.clear()
+        if outcome is not None:
+            history.reset()
+            if not json_lines:
+                # interact ends with the game
+                break
+        elif not json_lines:
+            draw(position)
+    flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play an a1 maze with commands read from a pipe.")
+    parser.add_argument('maze', help="maze file")
+    parser.add_argument('--json', action='store_true',
+                        help="reply with one JSON object per command")
+    parser.add_argument('--chunk-size', type=int, default=PIPE_CHUNK_SIZE,
+                        help="bytes read from the pipe at once")
+    args = parser.parse_args()
+
+    maze = load_parsed_maze(args.maze)
+    protocol = PROTOCOL_JSON if args.json else PROTOCOL_TEXT
+    serve(maze, sys.stdin.buffer, sys.stdout.buffer, protocol,
+          args.chunk_size)
+
+
+if __name__ == '__main__':
+    main()
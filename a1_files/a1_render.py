@@ -0,0 +1,193 @@
+"""
+Viewport rendering for a1 mazes.
+
+Rather than printing the whole maze every turn (as print_maze does), these
+functions only draw a window of the maze around the player, so the cost of a
+turn does not depend on the size of the maze. On ANSI terminals a
+ViewportRenderer only redraws the two squares that changed when the player
+moves within the window.
+"""
+
+import sys
+
+from a1_support import *
+
+# Default number of rows and columns of the maze shown in a viewport
+VIEWPORT_ROWS = 21
+VIEWPORT_COLUMNS = 61
+
+# ANSI escape sequences
+ANSI_CLEAR_SCREEN = "\x1b[2J"
+ANSI_CLEAR_BELOW = "\x1b[J"
+ANSI_MOVE_CURSOR = "\x1b[{};{}H"  # 1-based line, column
+
+
+def _maze_text(maze, start, end):
+    """
+    Returns the part of maze's string from index start up to end.
+
+    _maze_text(str|Maze, int, int) -> str
+    """
+    if isinstance(maze, str):
+        return maze[start:end]
+    return maze.get_text(start, end)
+
+
+def viewport_origin(position, maze_size, viewport_size):
+    """
+    Returns the (row, column) of the top left square of a viewport of
+    viewport_size centred on position, kept inside a maze of maze_size.
+
+    viewport_origin((int, int), (int, int), (int, int)) -> (int, int)
+    """
+    origin = []
+    for centre, maze_length, length in zip(position, maze_size,
+                                           viewport_size):
+        start = centre - length // 2
+        origin.append(max(0, min(start, maze_length - length)))
+    return tuple(origin)
+
+
+def format_viewport(maze, position, origin, viewport_size):
+    """
+    Returns the rows of maze inside the viewport of viewport_size whose top
+    left square is at origin, with the player shown at position.
+
+    format_viewport(str|Maze, (int, int), (int, int), (int, int)) -> str
+    """
+    columns = maze_columns(maze)
+    top, left = origin
+    rows = min(viewport_size[0], maze_rows(maze) - top)
+    width = min(viewport_size[1], columns - left)
+
+    lines = []
+    for row in range(top, top + rows):
+        start = position_to_index((row, left), columns)
+        line = _maze_text(maze, start, start + width)
+        if row == position[0]:
+            column = position[1] - left
+            line = line[:column] + PLAYER + line[column + 1:]
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def print_viewport(maze, position, viewport_size=(VIEWPORT_ROWS,
+                                                  VIEWPORT_COLUMNS)):
+    """
+    Prints the part of maze within a viewport of viewport_size centred on
+    the player at position.
+
+    print_viewport(str|Maze, (int, int), (int, int)) -> None
+    """
+    origin = viewport_origin(position, (maze_rows(maze), maze_columns(maze)),
+                             viewport_size)
+    print(format_viewport(maze, position, origin, viewport_size))
+
+
+class ViewportRenderer(object):
+    """
+    Draws a window of a maze around the player each turn.
+
+    On an ANSI terminal the viewport stays in place at the top of the screen
+    until the player comes within a margin of its edge, and moving inside it
+    only redraws the square the player left and the square they entered.
+    Messages passed to write are shown beneath the viewport and kept there
+    across the next draw. Otherwise the viewport is printed in full each
+    turn, as print_maze would.
+    """
+
+    def __init__(self, maze, rows=VIEWPORT_ROWS, columns=VIEWPORT_COLUMNS,
+                 ansi=None):
+        """
+        Constructs a renderer for maze with a viewport of rows by columns.
+        If ansi is None, ANSI drawing is used iff stdout is a terminal.
+
+        ViewportRenderer(str|Maze, int, int, bool) -> ViewportRenderer
+        """
+        self._maze = maze
+        self._maze_size = (maze_rows(maze), maze_columns(maze))
+        self._size = (min(rows, self._maze_size[0]),
+                      min(columns, self._maze_size[1]))
+        self._margin = tuple(length // 4 for length in self._size)
+
+        if ansi is None:
+            ansi = sys.stdout.isatty()
+        self._ansi = ansi
+        self._origin = None
+        self._position = None
+        self._messages = []
+
+    def _needs_scroll(self, position):
+        """
+        Returns True iff the viewport must move to show position comfortably.
+
+        _needs_scroll((int, int)) -> bool
+        """
+        if self._origin is None:
+            return True
+        for centre, start, length, margin, maze_length in zip(
+                position, self._origin, self._size, self._margin,
+                self._maze_size):
+            low = start + margin if start > 0 else start
+            high = (start + length - margin
+                    if start + length < maze_length else maze_length)
+            if not low <= centre < high:
+                return True
+        return False
+
+    def _move_cursor(self, position):
+        """
+        Returns the escape sequence moving the cursor to the square at
+        position inside the viewport.
+
+        _move_cursor((int, int)) -> str
+        """
+        row, column = position
+        top, left = self._origin
+        return ANSI_MOVE_CURSOR.format(row - top + 1, column - left + 1)
+
+    def draw(self, position):
+        """
+        Draws the viewport with the player at position.
+
+        draw((int, int)) -> None
+        """
+        if not self._ansi:
+            origin = viewport_origin(position, self._maze_size, self._size)
+            print()
+            print(format_viewport(self._maze, position, origin, self._size))
+            print()
+            return
+
+        if self._needs_scroll(position):
+            self._origin = viewport_origin(position, self._maze_size,
+                                           self._size)
+            text = (ANSI_CLEAR_SCREEN + ANSI_MOVE_CURSOR.format(1, 1)
+                    + format_viewport(self._maze, position, self._origin,
+                                      self._size))
+        elif position != self._position:
+            old = self._position
+            old_index = position_to_index(old, self._maze_size[1])
+            old_square = self._maze[old_index]
+            text = (self._move_cursor(old) + old_square
+                    + self._move_cursor(position) + PLAYER)
+        else:
+            text = ''
+
+        self._position = position
+        text += (ANSI_MOVE_CURSOR.format(self._size[0] + 2, 1)
+                 + ANSI_CLEAR_BELOW)
+        for message in self._messages:
+            text += message + '\n'
+        self._messages = []
+        print(text, end='', flush=True)
+
+    def write(self, message):
+        """
+        Prints message beneath the viewport, like print.
+
+        write(str) -> None
+        """
+        print(message)
+        if self._ansi:
+            self._messages.append(message)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Non-interactive replay of recorded interact sessions.
+
+Commands are read one per line from a file (or stdin) and run against a maze
+exactly as interact would run them, restarting from START_POSITION whenever
+a game ends. The output interact would have printed is buffered and written
+in batches, so long command streams can be checked against recorded
+transcripts.
+
+Usage: a1_replay.py maze_file [commands_file] [--no-render] [--quiet]
+"""
+
+import argparse
+import sys
+import time
+
+from a1 import *
+
+# Number of output pieces buffered before they are written out
+REPLAY_BATCH_SIZE = 1 << 14
+
+REPLAY_SUMMARY_FORMAT = ("{commands} commands, {games} games "
+                         "({won} won, {lost} lost, {quit} quit) "
+                         "in {seconds:.3f}s: {rate:,.0f} commands/sec")
+
+
+def replay(maze, commands, output=None, render=True):
+    """
+    Runs each command in commands (an iterable of lines as typed at the
+    interact prompt) against maze. Everything interact would print is
+    written to output in batches; if render is False the maze and prompts
+    are left out, and if output is None nothing is written at all.
+
+    Returns a dictionary counting the commands run, the games played and
+    each way a game ended (GAME_WON, GAME_LOST, GAME_QUIT).
+
+    replay(str|Maze, iter(str), file, bool) -> dict(str: int)
+    """
+    counts = {'commands': 0, 'games': 0, GAME_WON: 0, GAME_LOST: 0,
+              GAME_QUIT: 0}
+    pieces = []
+    columns = maze_columns(maze)
+    commands = iter(commands)
+
+    if output is None:
+        def write(message):
+            pass
+    else:
+        def write(message):
+            pieces.append(message)
+            pieces.append('\n')
+
+    def ask(prompt):
+        if output is not None and render:
+            pieces.append(prompt)
+        return next(commands, '').rstrip('\n')
+
+    history = MoveHistory()
+    for command in commands:
+        if output is not None:
+            if render:
+                index = position_to_index(history.get_position(),
+                                          columns)
+                pieces.append('\n')
+                if isinstance(maze, str):
+                    pieces.extend((maze[:index], PLAYER, maze[index + 1:]))
+                else:
+                    pieces.extend(maze.iter_text(index))
+                pieces.append('\n\nCommand: ')
+            if len(pieces) > REPLAY_BATCH_SIZE:
+                output.write(''.join(pieces))
+                pieces.clear()
+
+        counts['commands'] += 1
+        outcome = play_command(maze, history, command.strip().lower(), ask,
+                               write)
+        if outcome is not None:
+            counts['games'] += 1
+            counts[outcome] += 1
+            history.reset()
+
+    if pieces:
+        output.write(''.join(pieces))
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay interact commands against an a1 maze.")
+    parser.add_argument('maze', help="maze file")
+    parser.add_argument('commands', nargs='?', default='-',
+                        help="file of commands, one per line (default stdin)")
+    parser.add_argument('--no-render', action='store_true',
+                        help="only print messages, not the maze or prompts")
+    parser.add_argument('--quiet', action='store_true',
+                        help="print nothing but the summary")
+    args = parser.parse_args()
+
+    maze = load_parsed_maze(args.maze)
+    if args.commands == '-':
+        commands = sys.stdin
+    else:
+        commands = open(args.commands, 'r')
+
+    output = None if args.quiet else sys.stdout
+    start = time.perf_counter()
+    with commands:
+        counts = replay(maze, commands, output, not args.no_render)
+    seconds = time.perf_counter() - start
+
+    print(REPLAY_SUMMARY_FORMAT.format(
+        seconds=seconds, rate=counts['commands'] / max(seconds, 1e-9),
+        **counts), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
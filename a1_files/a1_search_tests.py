@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Seeded equivalence checks for the searches in a1_solver.
+
+Every search method is run on random small mazes and compared with the
+breadth-first search: each must find a route exactly when it does, of the
+same length, and its route must be legal, never entering a wall or a
+BAD_POKEMON and ending on the GOOD_POKEMON.
+
+Usage: a1_search_tests.py [--seed N] [--count N]
+"""
+
+import sys
+
+from a1_support import *
+from a1_solver import *
+from a1_test_support import *
+
+
+def follow_route(text, route):
+    """
+    Returns the square a route ends on from START_POSITION, or None if it
+    enters a wall or a BAD_POKEMON (or reaches the GOOD_POKEMON early).
+
+    follow_route(str, list(str)) -> str
+    """
+    columns = maze_columns(text)
+    row, column = START_POSITION
+    square = OPEN
+    for direction in route:
+        if square != OPEN:
+            return None
+        delta_row, delta_column = DIRECTION_DELTAS[direction]
+        row, column = row + delta_row, column + delta_column
+        square = text[position_to_index((row, column), columns)]
+        if square == WALL or square in BAD_POKEMON:
+            return None
+    return square
+
+
+def check_maze(text):
+    """
+    Returns a list of the problems found comparing the search methods on
+    text, a maze string; an empty list means every check passed.
+
+    check_maze(str) -> list(str)
+    """
+    errors = []
+    expected = solve(Maze(text), START_POSITION, SEARCH_BFS)
+    for method in SEARCHES:
+        route = solve(Maze(text), START_POSITION, method)
+        if (route is None) != (expected is None):
+            errors.append("{} found {} route".format(
+                method, "no" if route is None else "a"))
+        elif route is not None:
+            if len(route) != len(expected):
+                errors.append("{} route has {} moves, expected {}".format(
+                    method, len(route), len(expected)))
+            if follow_route(text, route) != GOOD_POKEMON:
+                errors.append("{} route is not legal".format(method))
+    return errors
+
+
+def main():
+    return run_checks(
+        "Check the search methods against BFS on random mazes.",
+        check_maze, 3000, max_size=16, walled=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
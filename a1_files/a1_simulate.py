@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo difficulty estimates for a1 mazes.
+
+Thousands of random walkers start at START_POSITION together, and at each
+step every walker moves in a direction chosen uniformly from the legal
+directions of its square. The walkers are held in NumPy arrays of flat
+indices (see position_to_index) and moved with the Maze legal direction
+table, so each step is a handful of whole-array operations.
+
+Run this file with maze files as arguments to print their difficulty
+statistics as JSON lines.
+"""
+
+import json
+import sys
+import time
+
+import numpy as np
+
+from a1_support import *
+
+DEFAULT_AGENTS = 100000
+DEFAULT_MAX_STEPS = 10000
+
+# Square kinds: open squares, the GOOD_POKEMON, then each BAD_POKEMON
+_OPEN_KIND = 0
+_GOOD_KIND = 1
+_BAD_KINDS = {letter: kind for kind, letter in enumerate(BAD_POKEMON, 2)}
+
+# Every mask's number of legal directions divides this, so a random number
+# below it modulo that count picks each legal direction equally often
+_CHOICES = 12
+
+
+def _move_tables(columns):
+    """
+    Returns arrays giving, for each legal direction mask, the number of legal
+    directions and the index offsets of those directions. A mask with no
+    legal directions gets one offset of 0, so its walkers stay put.
+
+    _move_tables(int) -> (numpy.ndarray, numpy.ndarray)
+    """
+    offsets = {direction: delta_row * (columns + 1) + delta_column
+               for direction, (delta_row, delta_column)
+               in DIRECTION_DELTAS.items()}
+
+    counts = np.ones(len(MASK_DIRECTIONS), dtype=np.int64)
+    moves = np.zeros((len(MASK_DIRECTIONS), len(DIRECTIONS)), dtype=np.int64)
+    for mask, directions in enumerate(MASK_DIRECTIONS):
+        if directions:
+            counts[mask] = len(directions)
+            moves[mask, :len(directions)] = [offsets[direction]
+                                             for direction in directions]
+    return counts, moves
+
+
+def simulate(maze, agents=DEFAULT_AGENTS, max_steps=DEFAULT_MAX_STEPS,
+             seed=None):
+    """
+    Releases agents random walkers from START_POSITION in maze, following
+    each until it finds a Pokemon or has taken max_steps steps.
+
+    Returns a dictionary with the fraction of walkers that win, the fraction
+    lost to each BAD_POKEMON, the fraction still walking after max_steps,
+    the mean number of steps taken by walkers that found a Pokemon, and the
+    agent-steps simulated per second.
+
+    simulate(str|Maze, int, int, int) -> dict(str: *)
+    """
+    if isinstance(maze, str):
+        maze = Maze(maze)
+
+    start_time = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    legal = np.frombuffer(maze.get_legal_table(), dtype=np.uint8)
+    counts, moves = _move_tables(maze.get_columns())
+
+    kinds = np.full(len(maze), _OPEN_KIND, dtype=np.uint8)
+    for index, letter in maze.get_pokemon().items():
+        if letter == GOOD_POKEMON:
+            kinds[index] = _GOOD_KIND
+        elif letter in _BAD_KINDS:
+            kinds[index] = _BAD_KINDS[letter]
+
+    start = position_to_index(START_POSITION, maze.get_columns())
+    positions = np.full(agents, start, dtype=np.int64)
+    outcomes = np.zeros(2 + len(BAD_POKEMON), dtype=np.int64)
+    finished_steps = 0
+    agent_steps = 0
+
+    for step in range(1, max_steps + 1):
+        if not positions.size:
+            break
+        masks = legal[positions]
+        choices = rng.integers(0, _CHOICES, positions.size, dtype=np.uint8)
+        positions += moves[masks, choices % counts[masks]]
+        agent_steps += positions.size
+
+        found = kinds[positions]
+        done = found != _OPEN_KIND
+        if done.any():
+            outcomes += np.bincount(found[done], minlength=outcomes.size)
+            finished_steps += step * int(np.count_nonzero(done))
+            positions = positions[~done]
+
+    seconds = time.perf_counter() - start_time
+    finished = int(outcomes[_GOOD_KIND:].sum())
+    return {
+        'agents': agents,
+        'win': int(outcomes[_GOOD_KIND]) / agents,
+        'lose': {letter: int(outcomes[kind]) / agents
+                 for letter, kind in _BAD_KINDS.items()},
+        'unfinished': positions.size / agents,
+        'mean_steps': finished_steps / finished if finished else None,
+        'agent_steps_per_second': agent_steps / seconds,
+    }
+
+
+def main():
+    for filename in sys.argv[1:]:
+        stats = simulate(load_parsed_maze(filename))
+        stats['file'] = filename
+        print(json.dumps(stats))
+
+
+if __name__ == '__main__':
+    main()
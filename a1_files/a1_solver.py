@@ -0,0 +1,541 @@
+"""
+Shortest path solving, move hints and reachability for a1 mazes.
+
+The searches work entirely on flat indices (see position_to_index) using the
+Maze legal direction table, with preallocated arrays recording how each
+square was reached, so no position tuples or sets are built per square.
+"""
+
+from array import array
+import heapq
+
+from a1_support import *
+
+# Ways solve can search for a route
+SEARCH_BFS = 'bfs'
+SEARCH_BIDIRECTIONAL = 'bidirectional'
+SEARCH_JUMP_POINT = 'jps'
+
+# Marks a square a distance_field search must not enter
+_BLOCKED = -2
+
+_OPPOSITE_DIRECTIONS = {'n': 's', 's': 'n', 'e': 'w', 'w': 'e'}
+
+
+def _direction_steps(stride):
+    """
+    Returns (bit, offset, code) for each direction in DIRECTIONS order, where
+    code (1 + position in DIRECTIONS) records the direction in came_from.
+
+    _direction_steps(int) -> list((int, int, int))
+    """
+    offsets = {'n': -stride, 's': stride, 'e': 1, 'w': -1}
+    return [(DIRECTION_BITS[direction], offsets[direction], code)
+            for code, direction in enumerate(DIRECTIONS, 1)]
+
+
+def _mask_moves(stride):
+    """
+    Returns, for each legal direction mask, the (offset, code) pair of each
+    of its legal directions (see _direction_steps).
+
+    _mask_moves(int) -> list(list((int, int)))
+    """
+    steps = _direction_steps(stride)
+    return [[(offset, code) for bit, offset, code in steps if mask & bit]
+            for mask in range(len(MASK_DIRECTIONS))]
+
+
+def solve(maze, start=START_POSITION, method=SEARCH_BFS):
+    """
+    Returns the shortest list of directions leading from start to the
+    GOOD_POKEMON, never entering a BAD_POKEMON square, or None if there is
+    no such route. method chooses the search used (see SEARCHES); all of
+    them find a route of the same length.
+
+    solve(str|Maze, (int, int), str) -> list(str)
+    """
+    return search(maze, start, method)[0]
+
+
+def search(maze, start=START_POSITION, method=SEARCH_BFS):
+    """
+    Searches for a route as solve does, returning the route along with the
+    number of squares expanded (taken off the frontier) and scanned (looked
+    at as a possible next step) by the search.
+
+    search(str|Maze, (int, int), str) -> (list(str), int, int)
+    """
+    if isinstance(maze, str):
+        maze = Maze(maze)
+    return SEARCHES[method](maze, start)
+
+
+def _goals_and_dangers(maze):
+    """
+    Returns the indices of the GOOD_POKEMON and of the BAD_POKEMON in maze.
+
+    _goals_and_dangers(Maze) -> (list(int), list(int))
+    """
+    goals = []
+    dangers = []
+    for index, letter in maze.get_pokemon().items():
+        if letter == GOOD_POKEMON:
+            goals.append(index)
+        elif letter in BAD_POKEMON:
+            dangers.append(index)
+    return goals, dangers
+
+
+def _breadth_first_search(maze, start):
+    """
+    Searches outwards from start one layer at a time.
+
+    _breadth_first_search(Maze, (int, int)) -> (list(str), int, int)
+    """
+    columns = maze.get_columns()
+    stride = columns + 1
+    legal = maze.get_legal_table()
+    start_index = position_to_index(start, columns)
+
+    goals, dangers = _goals_and_dangers(maze)
+    came_from = bytearray(len(maze))
+    for index in dangers:
+        came_from[index] = 255  # Never entered
+
+    if start_index in goals:
+        return [], 0, 0
+
+    moves = _mask_moves(stride)
+    expanded = scanned = 0
+
+    came_from[start_index] = 255
+    frontier = [start_index]
+    while frontier:
+        next_frontier = []
+        append = next_frontier.append
+        for index in frontier:
+            index_moves = moves[legal[index]]
+            scanned += len(index_moves)
+            for offset, code in index_moves:
+                neighbour = index + offset
+                if not came_from[neighbour]:
+                    came_from[neighbour] = code
+                    append(neighbour)
+        expanded += len(frontier)
+        frontier = next_frontier
+
+        for goal in goals:
+            if came_from[goal]:
+                return (_route(came_from, goal, start_index, stride),
+                        expanded, scanned)
+
+    return None, expanded, scanned
+
+
+def _bidirectional_search(maze, start):
+    """
+    Searches outwards from start and from every GOOD_POKEMON at once, a
+    layer at a time from whichever side has the smaller frontier, until the
+    two searches meet.
+
+    _bidirectional_search(Maze, (int, int)) -> (list(str), int, int)
+    """
+    columns = maze.get_columns()
+    stride = columns + 1
+    legal = maze.get_legal_table()
+    start_index = position_to_index(start, columns)
+    moves = _mask_moves(stride)
+
+    goals, dangers = _goals_and_dangers(maze)
+    if start_index in goals:
+        return [], 0, 0
+
+    # Forward (side 0) and backward (side 1) distances and came_from codes
+    distances = (array('i', [-1]) * len(maze), array('i', [-1]) * len(maze))
+    came_from = (bytearray(len(maze)), bytearray(len(maze)))
+    for index in dangers:
+        distances[0][index] = distances[1][index] = _BLOCKED
+    frontiers = [[start_index], []]
+    distances[0][start_index] = 0
+    for index in goals:
+        distances[1][index] = 0
+        frontiers[1].append(index)
+
+    expanded = scanned = 0
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        mine, other = distances[side], distances[1 - side]
+        codes = came_from[side]
+
+        # The whole layer is expanded before stopping, as a later square in
+        # it may meet the other search by a shorter route
+        best = None
+        next_frontier = []
+        append = next_frontier.append
+        for index in frontiers[side]:
+            distance = mine[index] + 1
+            index_moves = moves[legal[index]]
+            scanned += len(index_moves)
+            for offset, code in index_moves:
+                neighbour = index + offset
+                if mine[neighbour] == -1:
+                    mine[neighbour] = distance
+                    codes[neighbour] = code
+                    append(neighbour)
+                    if other[neighbour] >= 0:
+                        length = distance + other[neighbour]
+                        if best is None or length < best[0]:
+                            best = (length, neighbour)
+        expanded += len(frontiers[side])
+        frontiers[side] = next_frontier
+
+        if best is not None:
+            meeting = best[1]
+            route = _route(came_from[0], meeting, start_index, stride)
+            offsets = [offset for bit, offset, code
+                       in _direction_steps(stride)]
+            index = meeting
+            while distances[1][index]:
+                code = came_from[1][index]
+                route.append(_OPPOSITE_DIRECTIONS[DIRECTIONS[code - 1]])
+                index -= offsets[code - 1]
+            return route, expanded, scanned
+
+    return None, expanded, scanned
+
+
+def _jump_point_search(maze, start):
+    """
+    A* search over jump points, for mazes with large open areas.
+
+    Of the many equally short routes across an open area, only those making
+    their vertical moves as early as possible are followed: a horizontal
+    run only turns where it passes the end of a wall beside it, and a
+    vertical run only stops where a horizontal run from it would. The
+    squares where runs stop (the jump points) are the only ones put on the
+    open list, ordered by their distance from start plus the Manhattan
+    distance to the nearest GOOD_POKEMON.
+
+    _jump_point_search(Maze, (int, int)) -> (list(str), int, int)
+    """
+    columns = maze.get_columns()
+    stride = columns + 1
+    size = len(maze)
+    start_index = position_to_index(start, columns)
+
+    goals, dangers = _goals_and_dangers(maze)
+    if start_index in goals:
+        return [], 0, 0
+    if not goals:
+        return None, 0, 0
+    goals = set(goals)
+    goal_positions = [divmod(index, stride) for index in goals]
+
+    passable = bytearray(maze._open_flags())
+    for index in dangers:
+        passable[index] = 0
+    scanned = 0
+
+    def is_open(index):
+        return 0 <= index < size and passable[index]
+
+    def jump_horizontally(index, step):
+        nonlocal scanned
+        while True:
+            index += step
+            scanned += 1
+            if not is_open(index):
+                return None
+            if index in goals:
+                return index
+            for side in (-stride, stride):
+                if is_open(index + side) and not is_open(index - step + side):
+                    return index
+
+    def jump_vertically(index, step):
+        nonlocal scanned
+        while True:
+            index += step
+            scanned += 1
+            if not is_open(index):
+                return None
+            if (index in goals or jump_horizontally(index, 1) is not None
+                    or jump_horizontally(index, -1) is not None):
+                return index
+
+    def heuristic(index):
+        row, column = divmod(index, stride)
+        return min(abs(row - goal_row) + abs(column - goal_column)
+                   for goal_row, goal_column in goal_positions)
+
+    # Each open list entry is (estimate, distance, index, step it was
+    # reached by), where step is 0 for start
+    best = {start_index: 0}
+    parents = {start_index: None}
+    open_list = [(heuristic(start_index), 0, start_index, 0)]
+    expanded = 0
+    while open_list:
+        estimate, distance, index, step = heapq.heappop(open_list)
+        if distance > best[index]:
+            continue
+        expanded += 1
+        if index in goals:
+            return _jump_route(parents, index, stride), expanded, scanned
+
+        if step == 0:
+            steps = (-stride, stride, 1, -1)
+        elif step in (1, -1):
+            steps = [step] + [side for side in (-stride, stride)
+                              if is_open(index + side)
+                              and not is_open(index - step + side)]
+        else:
+            steps = (step, 1, -1)
+
+        for next_step in steps:
+            if next_step in (1, -1):
+                jump_point = jump_horizontally(index, next_step)
+                if jump_point is not None:
+                    length = abs(jump_point - index)
+            else:
+                jump_point = jump_vertically(index, next_step)
+                if jump_point is not None:
+                    length = abs(jump_point - index) // stride
+            if jump_point is None:
+                continue
+            jump_distance = distance + length
+            if jump_distance < best.get(jump_point, jump_distance + 1):
+                best[jump_point] = jump_distance
+                parents[jump_point] = index
+                heapq.heappush(open_list, (
+                    jump_distance + heuristic(jump_point), jump_distance,
+                    jump_point, next_step))
+
+    return None, expanded, scanned
+
+
+def _jump_route(parents, index, stride):
+    """
+    Follows parents back from index to the start of a jump point search,
+    returning the directions of every move in order.
+
+    _jump_route(dict(int: int), int, int) -> list(str)
+    """
+    route = []
+    while parents[index] is not None:
+        parent = parents[index]
+        difference = index - parent
+        if abs(difference) < stride:
+            direction = 'e' if difference > 0 else 'w'
+            length = abs(difference)
+        else:
+            direction = 's' if difference > 0 else 'n'
+            length = abs(difference) // stride
+        route.extend(direction * length)
+        index = parent
+    route.reverse()
+    return route
+
+
+def _route(came_from, index, start_index, stride):
+    """
+    Follows came_from back from index to start_index, returning the
+    directions taken in order.
+
+    _route(bytearray, int, int, int) -> list(str)
+    """
+    offsets = [offset for bit, offset, code in _direction_steps(stride)]
+    route = []
+    while index != start_index:
+        code = came_from[index]
+        route.append(DIRECTIONS[code - 1])
+        index -= offsets[code - 1]
+    route.reverse()
+    return route
+
+
+# Search function for each way of searching
+SEARCHES = {
+    SEARCH_BFS: _breadth_first_search,
+    SEARCH_BIDIRECTIONAL: _bidirectional_search,
+    SEARCH_JUMP_POINT: _jump_point_search,
+}
+
+
+def distance_field(maze, sources, blocked=()):
+    """
+    Returns the number of moves from the nearest of sources (flat indices)
+    to every square of maze, never entering a square in blocked. Squares
+    that cannot be reached (including blocked ones) have a distance of -1.
+
+    distance_field(Maze, iter(int), iter(int)) -> array(i)
+    """
+    moves = _mask_moves(maze.get_columns() + 1)
+    legal = maze.get_legal_table()
+    distances = array('i', [-1]) * len(maze)
+
+    blocked = list(blocked)
+    for index in blocked:
+        distances[index] = _BLOCKED
+
+    frontier = []
+    for index in sources:
+        if distances[index] == -1:
+            distances[index] = 0
+            frontier.append(index)
+
+    distance = 0
+    while frontier:
+        distance += 1
+        next_frontier = []
+        append = next_frontier.append
+        for index in frontier:
+            for offset, code in moves[legal[index]]:
+                neighbour = index + offset
+                if distances[neighbour] == -1:
+                    distances[neighbour] = distance
+                    append(neighbour)
+        frontier = next_frontier
+
+    for index in blocked:
+        distances[index] = -1
+    return distances
+
+
+def _build_hint_fields(maze):
+    """
+    Returns the distance fields used to rank moves: the safe distance to
+    the GOOD_POKEMON (avoiding every BAD_POKEMON) and the distance to the
+    nearest BAD_POKEMON.
+
+    _build_hint_fields(Maze) -> (array(i), array(i))
+    """
+    goals, dangers = _goals_and_dangers(maze)
+    return (distance_field(maze, goals, dangers),
+            distance_field(maze, dangers))
+
+
+def rank_directions(maze, position):
+    """
+    Returns the legal directions from position, best first: closest to the
+    GOOD_POKEMON by a safe route, then furthest from any BAD_POKEMON.
+    The distance fields behind the ranking are computed once per Maze.
+
+    rank_directions(str|Maze, (int, int)) -> list(str)
+    """
+    if isinstance(maze, str):
+        maze = Maze(maze)
+    goal, danger = maze.get_table('hints', _build_hint_fields)
+
+    columns = maze.get_columns()
+    index = position_to_index(position, columns)
+    offsets = dict(zip(DIRECTIONS, (offset for bit, offset, code
+                                    in _direction_steps(columns + 1))))
+    unreachable = len(maze)
+
+    def badness(direction):
+        neighbour = index + offsets[direction]
+        to_goal, to_danger = goal[neighbour], danger[neighbour]
+        return (to_goal if to_goal >= 0 else unreachable,
+                -(to_danger if to_danger >= 0 else unreachable))
+
+    return sorted(MASK_DIRECTIONS[maze.get_legal_mask(index)], key=badness)
+
+
+def _build_components(maze):
+    """
+    Labels the connected regions of open squares, flood filling from each
+    open square not yet labelled. Pokemon squares count as open, so
+    BAD_POKEMON do not split regions.
+
+    Returns the label of every square (-1 for walls) and the number of
+    squares with each label.
+
+    _build_components(Maze) -> (array(i), array(Q))
+    """
+    moves = _mask_moves(maze.get_columns() + 1)
+    legal = maze.get_legal_table()
+    labels = array('i', [-1]) * len(maze)
+    sizes = array('Q')
+
+    # 1 for each open square that has not been labelled yet
+    unlabelled = bytearray(maze._open_flags())
+    start = unlabelled.find(1)
+    while start != -1:
+        label = len(sizes)
+        labels[start] = label
+        unlabelled[start] = 0
+        size = 1
+        frontier = [start]
+        while frontier:
+            next_frontier = []
+            append = next_frontier.append
+            for index in frontier:
+                for offset, code in moves[legal[index]]:
+                    neighbour = index + offset
+                    if unlabelled[neighbour]:
+                        unlabelled[neighbour] = 0
+                        labels[neighbour] = label
+                        append(neighbour)
+            size += len(next_frontier)
+            frontier = next_frontier
+        sizes.append(size)
+        start = unlabelled.find(1, start + 1)
+
+    return labels, sizes
+
+
+def component_labels(maze):
+    """
+    Returns the label of the connected region of open squares containing
+    each square of maze (-1 for walls), indexed as with position_to_index.
+    The labels are computed once per Maze.
+
+    component_labels(str|Maze) -> array(i)
+    """
+    if isinstance(maze, str):
+        maze = Maze(maze)
+    return maze.get_table('components', _build_components)[0]
+
+
+def component_sizes(maze):
+    """
+    Returns the number of squares in each connected region of maze, indexed
+    by label (see component_labels).
+
+    component_sizes(str|Maze) -> array(Q)
+    """
+    if isinstance(maze, str):
+        maze = Maze(maze)
+    return maze.get_table('components', _build_components)[1]
+
+
+def is_reachable(maze, start, end):
+    """
+    Returns True iff the open square at position end can be reached from
+    the open square at position start, ignoring what Pokemon are in the way.
+
+    is_reachable(str|Maze, (int, int), (int, int)) -> bool
+    """
+    if isinstance(maze, str):
+        maze = Maze(maze)
+    labels = component_labels(maze)
+    columns = maze.get_columns()
+    label = labels[position_to_index(start, columns)]
+    return label != -1 and label == labels[position_to_index(end, columns)]
+
+
+def pokemon_components(maze):
+    """
+    Returns a dictionary mapping each Pokemon letter in maze to the set of
+    labels (see component_labels) of the regions it appears in.
+
+    pokemon_components(str|Maze) -> dict(str: set(int))
+    """
+    if isinstance(maze, str):
+        maze = Maze(maze)
+    labels = component_labels(maze)
+    components = {}
+    for index, letter in maze.get_pokemon().items():
+        components.setdefault(letter, set()).add(labels[index])
+    return components
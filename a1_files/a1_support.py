@@ -1,4 +1,9 @@
+from array import array
+import bisect
+import mmap
+import os
 import random
+import re
 
 # Maze symbol constants
 WALL = '#'
@@ -40,6 +45,13 @@ q - Quit."""
 
 LOSE_TEXT = "Oh no! A wild {} appeared - you lose :("
 WIN_TEXT = "Congratulations - you found {}!"
+SOLVE_TEXT = "Shortest route to {}: {}"
+NO_SOLUTION_TEXT = "There is no safe route to {}."
+
+# Ways a game can end
+GAME_WON = 'won'
+GAME_LOST = 'lost'
+GAME_QUIT = 'quit'
 
 def load_maze(filename):
     """
@@ -55,19 +67,38 @@ def maze_columns(maze):
     """
     Returns the number of columns in the maze.
 
-    maze_columns(str) -> int
+    maze_columns(str|Maze) -> int
     """
 
-    return maze.find('\n')
+    if isinstance(maze, str):
+        return maze.find('\n')
+    return maze.get_columns()
 
 def maze_rows(maze):
     """
     Returns the number of rows in the maze.
 
-    maze_rows(str) -> int
+    maze_rows(str|Maze) -> int
+    """
+
+    if isinstance(maze, str):
+        return maze.count('\n') + 1
+    return maze.get_rows()
+
+def is_rectangular(maze):
+    """
+    Returns True iff every row of maze, a maze string, has the same number
+    of columns, so position_to_index can be used on it.
+
+    is_rectangular(str) -> bool
     """
 
-    return maze.count('\n') + 1
+    columns = maze_columns(maze)
+    if columns == -1:
+        return True
+    newlines = maze.count('\n')
+    return (len(maze) == (newlines + 1) * (columns + 1) - 1
+            and maze[columns::columns + 1] == '\n' * newlines)
 
 def position_to_index(position, columns):
     """
@@ -91,6 +122,786 @@ def index_to_position(index, columns):
 
     return row, column
 
+# Byte values used by Maze to flag each index of its wall grid
+_OPEN_FLAG = 0
+_WALL_FLAG = 1
+_ROW_END_FLAG = 2
+
+# Translation tables between maze text and Maze wall flags
+_WALL_FLAGS = bytearray([_WALL_FLAG]) * 256
+_WALL_FLAGS[ord(OPEN)] = _OPEN_FLAG
+_WALL_FLAGS[ord('\n')] = _ROW_END_FLAG
+_FLAG_SQUARES = (OPEN + WALL + '\n').encode('ascii') + bytes(253)
+_OPEN_BYTES = bytes([1]) + bytes(255)
+
+# Translation table from maze text to 1 for enterable squares, else 0
+_SQUARE_OPEN = bytearray([1]) * 256
+_SQUARE_OPEN[ord(WALL)] = 0
+_SQUARE_OPEN[ord('\n')] = 0
+
+_POKEMON_PATTERN = re.compile(b'[^# \n]')
+_NON_ASCII_PATTERN = re.compile(b'[\x80-\xff]')
+_WHITESPACE = b' \t\r\n\x0b\x0c'
+_TEXT_CHUNK_SIZE = 1 << 20
+
+# Bit used for each direction in a legal direction mask, in DIRECTIONS order
+DIRECTION_BITS = {direction: 1 << bit
+                  for bit, direction in enumerate(DIRECTIONS)}
+
+# The legal directions for each possible mask, in DIRECTIONS order
+MASK_DIRECTIONS = tuple(
+    tuple(direction for direction in DIRECTIONS
+          if mask & DIRECTION_BITS[direction])
+    for mask in range(1 << len(DIRECTIONS)))
+
+class Maze(object):
+    """
+    A maze parsed once from its text representation.
+
+    Walls are kept in a bytearray with one flag per index (using the same
+    indexing as position_to_index), and Pokemon squares are kept in a sparse
+    dictionary, so checking a square is O(1) and never touches the text.
+    A Maze can be used anywhere a maze string is expected by move,
+    get_legal_directions and print_maze.
+    """
+
+    def __init__(self, text):
+        """
+        Parses text, a maze string as returned by load_maze.
+
+        Maze(str) -> Maze
+        """
+        self._columns = text.find('\n')
+        if self._columns == -1:
+            self._columns = len(text)
+        self._rows = text.count('\n') + 1
+
+        # Every character other than open squares and newlines is flagged as
+        # a wall first; Pokemon squares are then reopened below. Non-ASCII
+        # characters are encoded as '?' so that indices are kept.
+        self._walls = bytearray(
+            text.encode('ascii', 'replace').translate(_WALL_FLAGS))
+        self._pokemon = {}
+        for match in re.finditer('[^# \n]', text):
+            index = match.start()
+            self._walls[index] = _OPEN_FLAG
+            self._pokemon[index] = match.group()
+
+        self._pokemon_order = None
+        self._legal = None
+        self._tables = {}
+
+    def get_columns(self):
+        """
+        Returns the number of columns in the maze.
+
+        get_columns() -> int
+        """
+        return self._columns
+
+    def get_rows(self):
+        """
+        Returns the number of rows in the maze.
+
+        get_rows() -> int
+        """
+        return self._rows
+
+    def is_wall(self, index):
+        """
+        Returns True iff the square at index cannot be entered.
+
+        is_wall(int) -> bool
+        """
+        return self._walls[index] != _OPEN_FLAG
+
+    def get_legal_mask(self, index):
+        """
+        Returns the legal direction mask of the square at index, with one
+        DIRECTION_BITS bit set for each open neighbouring square. Walls have
+        a mask of 0.
+
+        get_legal_mask(int) -> int
+        """
+        return self.get_legal_table()[index]
+
+    def _find_legal_mask(self, index):
+        """
+        Returns the legal direction mask of the square at index by checking
+        its neighbours with is_wall, without a legal direction table.
+
+        _find_legal_mask(int) -> int
+        """
+        if self.is_wall(index):
+            return 0
+
+        stride = self._columns + 1
+        offsets = (-stride, stride, 1, -1)
+        mask = 0
+        for direction, offset in zip(DIRECTIONS, offsets):
+            neighbour = index + offset
+            if 0 <= neighbour < len(self) and not self.is_wall(neighbour):
+                mask |= DIRECTION_BITS[direction]
+        return mask
+
+    def get_legal_table(self):
+        """
+        Returns the legal direction mask of every square, indexed as with
+        position_to_index. The table is built on first use.
+
+        get_legal_table() -> array(B)
+        """
+        if self._legal is None:
+            self._legal = self._build_legal_table()
+        return self._legal
+
+    def _build_legal_table(self):
+        """
+        Computes the legal direction mask of every square in one pass.
+
+        Each byte of a big integer holds whether one square is open, so
+        shifting it by a whole number of bytes lines every square up with a
+        neighbour; the shifts and ORs run at C speed over the whole grid.
+
+        _build_legal_table() -> array(B)
+        """
+        size = len(self)
+        stride = (self._columns + 1) * 8
+        is_open = int.from_bytes(self._open_flags(), 'little')
+
+        neighbours = {
+            'n': is_open << stride,
+            's': is_open >> stride,
+            'e': is_open >> 8,
+            'w': is_open << 8,
+        }
+        masks = 0
+        for direction, bit in DIRECTION_BITS.items():
+            masks |= neighbours[direction] * bit
+        # 15 in each open byte (no carries), so walls are cleared to 0
+        masks &= is_open * 0xf
+
+        table = array('B')
+        table.frombytes(masks.to_bytes(size, 'little'))
+        return table
+
+    def get_table(self, name, build):
+        """
+        Returns the precomputed table called name, calling build with this
+        Maze to compute it the first time it is asked for.
+
+        get_table(str, func) -> *
+        """
+        if name not in self._tables:
+            self._tables[name] = build(self)
+        return self._tables[name]
+
+    def _open_flags(self):
+        """
+        Returns a byte per index, 1 if the square can be entered, else 0.
+
+        _open_flags() -> bytes
+        """
+        return bytes(self._walls).translate(_OPEN_BYTES)
+
+    def get_pokemon(self):
+        """
+        Returns a dictionary mapping the index of each Pokemon square to the
+        letter of the Pokemon on it.
+
+        get_pokemon() -> dict(int: str)
+        """
+        return self._pokemon
+
+    def __getitem__(self, index):
+        """
+        Returns the character of the square at index, as in the maze string.
+
+        __getitem__(int) -> str
+        """
+        flag = self._walls[index]
+        if flag == _OPEN_FLAG:
+            return self._pokemon.get(index, OPEN)
+        elif flag == _WALL_FLAG:
+            return WALL
+        return '\n'
+
+    def __len__(self):
+        """
+        Returns the length of the equivalent maze string.
+
+        __len__() -> int
+        """
+        return len(self._walls)
+
+    def __str__(self):
+        """
+        Returns the maze string this Maze was parsed from.
+
+        __str__() -> str
+        """
+        return self.get_text(0, len(self))
+
+    def get_text(self, start, end):
+        """
+        Returns the part of the maze string from index start up to end.
+
+        get_text(int, int) -> str
+        """
+        if self._pokemon_order is None:
+            self._pokemon_order = sorted(self._pokemon)
+        order = self._pokemon_order
+
+        squares = bytearray(self._walls[start:end]).translate(_FLAG_SQUARES)
+        wide = []
+        for i in range(bisect.bisect_left(order, start),
+                       bisect.bisect_left(order, end)):
+            index = order[i]
+            letter = self._pokemon[index]
+            if letter > '\xff':
+                wide.append(index)
+            else:
+                squares[index - start] = ord(letter)
+        text = squares.decode('latin-1')
+        if wide:
+            # Letters outside Latin-1 do not fit in a byte
+            characters = list(text)
+            for index in wide:
+                characters[index - start] = self._pokemon[index]
+            text = ''.join(characters)
+        return text
+
+    def iter_text(self, player_index):
+        """
+        Yields the maze string in pieces, with the square at player_index
+        replaced by PLAYER.
+
+        iter_text(int) -> iter(str)
+        """
+        text = str(self)
+        yield text[:player_index]
+        yield PLAYER
+        yield text[player_index + 1:]
+
+class MappedMaze(Maze):
+    """
+    A maze read directly from a memory-mapped file.
+
+    Squares are read from the mapping on demand, so loading a maze costs
+    no more than mapping the file, however large it is. Surrounding
+    whitespace is ignored, as in load_maze. The file stays open until
+    close is called (or the MappedMaze is used as a context manager).
+    """
+
+    def __init__(self, filename):
+        """
+        Maps the maze in the file called filename. Raises ValueError if the
+        file is empty or has '\r' line endings, which load_maze would
+        translate but a mapping cannot, or if it is not ASCII (such as a
+        file starting with a byte order mark), as squares are bytes here.
+
+        MappedMaze(str) -> MappedMaze
+        """
+        self._file = open(filename, 'rb')
+        try:
+            if not os.fstat(self._file.fileno()).st_size:
+                raise ValueError("Cannot map an empty maze file")
+            self._buffer = buffer = mmap.mmap(self._file.fileno(), 0,
+                                              access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+
+        start, end = 0, len(buffer)
+        while start < end and buffer[start] in _WHITESPACE:
+            start += 1
+        while end > start and buffer[end - 1] in _WHITESPACE:
+            end -= 1
+        if buffer.find(b'\r', start, end) != -1:
+            self.close()
+            raise ValueError("Cannot map a maze file with '\\r' line "
+                             "endings; use load_maze instead")
+        if _NON_ASCII_PATTERN.search(buffer, start, end):
+            self.close()
+            raise ValueError("Cannot map a maze file that is not ASCII; "
+                             "use load_maze instead")
+        self._start = start
+        self._end = end
+
+        newline = buffer.find(b'\n', start, end)
+        self._columns = (end if newline == -1 else newline) - start
+        self._rows = 1
+        for chunk_start in range(start, end, _TEXT_CHUNK_SIZE):
+            chunk_end = min(chunk_start + _TEXT_CHUNK_SIZE, end)
+            self._rows += buffer[chunk_start:chunk_end].count(b'\n')
+
+        self._pokemon = None
+        self._legal = None
+        self._tables = {}
+
+    def close(self):
+        """
+        Unmaps the maze and closes its file.
+
+        close() -> None
+        """
+        self._buffer.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def is_wall(self, index):
+        """
+        Returns True iff the square at index cannot be entered.
+
+        is_wall(int) -> bool
+        """
+        return not _SQUARE_OPEN[self._buffer[self._start + index]]
+
+    def get_legal_mask(self, index):
+        """
+        Returns the legal direction mask of the square at index (see
+        Maze.get_legal_mask), from the legal direction table if one has been
+        built, else from the mapping around the square, so that a single
+        lookup does not build a table for the whole maze.
+
+        get_legal_mask(int) -> int
+        """
+        if self._legal is not None:
+            return self._legal[index]
+        return self._find_legal_mask(index)
+
+    def _open_flags(self):
+        """
+        Returns a byte per index, 1 if the square can be entered, else 0.
+
+        _open_flags() -> bytes
+        """
+        return self._buffer[self._start:self._end].translate(_SQUARE_OPEN)
+
+    def get_pokemon(self):
+        """
+        Returns a dictionary mapping the index of each Pokemon square to the
+        letter of the Pokemon on it. The mapping is scanned on first use.
+
+        get_pokemon() -> dict(int: str)
+        """
+        if self._pokemon is None:
+            self._pokemon = {}
+            for match in _POKEMON_PATTERN.finditer(self._buffer, self._start,
+                                                   self._end):
+                self._pokemon[match.start() - self._start] = \
+                    match.group().decode('ascii')
+        return self._pokemon
+
+    def __getitem__(self, index):
+        """
+        Returns the character of the square at index, as in the maze string.
+
+        __getitem__(int) -> str
+        """
+        return chr(self._buffer[self._start + index])
+
+    def __len__(self):
+        """
+        Returns the length of the equivalent maze string.
+
+        __len__() -> int
+        """
+        return self._end - self._start
+
+    def __str__(self):
+        """
+        Returns the maze string, copying the whole mapped maze.
+
+        __str__() -> str
+        """
+        return self._buffer[self._start:self._end].decode('ascii')
+
+    def get_text(self, start, end):
+        """
+        Returns the part of the maze string from index start up to end.
+
+        get_text(int, int) -> str
+        """
+        start = self._start + max(start, 0)
+        end = self._start + min(end, len(self))
+        return self._buffer[start:end].decode('ascii')
+
+    def iter_text(self, player_index):
+        """
+        Yields the maze string in pieces of bounded size, with the square at
+        player_index replaced by PLAYER.
+
+        iter_text(int) -> iter(str)
+        """
+        player_index += self._start
+        for start in range(self._start, self._end, _TEXT_CHUNK_SIZE):
+            end = min(start + _TEXT_CHUNK_SIZE, self._end)
+            if start <= player_index < end:
+                yield self._buffer[start:player_index].decode('ascii')
+                yield PLAYER
+                yield self._buffer[player_index + 1:end].decode('ascii')
+            else:
+                yield self._buffer[start:end].decode('ascii')
+
+class RaggedMaze(Maze):
+    """
+    A maze whose rows may have different lengths, such as a maze file saved
+    by an editor that trims trailing spaces.
+
+    The text is kept as it is, with a table of where each row starts in it,
+    so a position is found in the text in O(1) without making a padded copy.
+    Squares are indexed as in the equivalent rectangular maze string (see
+    position_to_index), as wide as the longest row; the squares missing
+    from the end of a shorter row are open.
+    """
+
+    def __init__(self, text):
+        """
+        Indexes the rows of text, a maze string as returned by load_maze, in
+        a single pass.
+
+        RaggedMaze(str) -> RaggedMaze
+        """
+        self._text = text
+        # The start of each row, then one past the end of the text, so row r
+        # runs from _row_starts[r] up to _row_starts[r + 1] - 1
+        starts = array('Q', [0])
+        columns = 0
+        newline = text.find('\n')
+        while newline != -1:
+            columns = max(columns, newline - starts[-1])
+            starts.append(newline + 1)
+            newline = text.find('\n', newline + 1)
+        columns = max(columns, len(text) - starts[-1])
+        starts.append(len(text) + 1)
+
+        self._row_starts = starts
+        self._columns = columns
+        self._rows = len(starts) - 1
+        self._pokemon = None
+        self._pokemon_order = None
+        self._legal = None
+        self._tables = {}
+
+    def get_row_length(self, row):
+        """
+        Returns the number of characters in row of the maze text.
+
+        get_row_length(int) -> int
+        """
+        return self._row_starts[row + 1] - self._row_starts[row] - 1
+
+    def get_offset(self, position):
+        """
+        Returns the offset in the maze text of the square at position, or
+        None if the position is past the end of its row.
+
+        get_offset((int, int)) -> int
+        """
+        row, column = position
+        if column < self.get_row_length(row):
+            return self._row_starts[row] + column
+        return None
+
+    def _get_square(self, index):
+        """
+        Returns the character of the square at index, or None for the newline
+        at the end of a row.
+
+        _get_square(int) -> str
+        """
+        row, column = divmod(index, self._columns + 1)
+        if column == self._columns:
+            return None
+        offset = self.get_offset((row, column))
+        if offset is None:
+            return OPEN
+        return self._text[offset]
+
+    def is_wall(self, index):
+        """
+        Returns True iff the square at index cannot be entered.
+
+        is_wall(int) -> bool
+        """
+        square = self._get_square(index)
+        return square is None or square == WALL
+
+    def _open_flags(self):
+        """
+        Returns a byte per index, 1 if the square can be entered, else 0.
+
+        _open_flags() -> bytes
+        """
+        columns = self._columns
+        stride = columns + 1
+        starts = self._row_starts
+
+        flags = bytearray([1]) * len(self)
+        flags[columns::stride] = bytes(self._rows - 1)
+        for row in range(self._rows):
+            line = self._text[starts[row]:starts[row + 1] - 1]
+            flags[row * stride:row * stride + len(line)] = \
+                line.encode('ascii', 'replace').translate(_SQUARE_OPEN)
+        return bytes(flags)
+
+    def get_pokemon(self):
+        """
+        Returns a dictionary mapping the index of each Pokemon square to the
+        letter of the Pokemon on it. The text is scanned on first use.
+
+        get_pokemon() -> dict(int: str)
+        """
+        if self._pokemon is None:
+            stride = self._columns + 1
+            starts = self._row_starts
+            self._pokemon = {}
+            for match in re.finditer('[^# \n]', self._text):
+                offset = match.start()
+                row = bisect.bisect_right(starts, offset) - 1
+                index = row * stride + offset - starts[row]
+                self._pokemon[index] = match.group()
+        return self._pokemon
+
+    def __getitem__(self, index):
+        """
+        Returns the character of the square at index, as in the equivalent
+        rectangular maze string.
+
+        __getitem__(int) -> str
+        """
+        square = self._get_square(index)
+        return '\n' if square is None else square
+
+    def __len__(self):
+        """
+        Returns the length of the equivalent rectangular maze string.
+
+        __len__() -> int
+        """
+        return self._rows * (self._columns + 1) - 1
+
+    def __str__(self):
+        """
+        Returns the equivalent rectangular maze string, with short rows
+        padded with open squares.
+
+        __str__() -> str
+        """
+        return self.get_text(0, len(self))
+
+    def get_text(self, start, end):
+        """
+        Returns the part of the equivalent rectangular maze string from index
+        start up to end.
+
+        get_text(int, int) -> str
+        """
+        columns = self._columns
+        stride = columns + 1
+        starts = self._row_starts
+
+        pieces = []
+        index = max(start, 0)
+        end = min(end, len(self))
+        while index < end:
+            row, column = divmod(index, stride)
+            if column == columns:
+                pieces.append('\n')
+                index += 1
+                continue
+
+            stop = min(end, row * stride + columns)
+            line_end = starts[row + 1] - 1
+            piece = self._text[min(starts[row] + column, line_end):
+                               min(starts[row] + stop - row * stride,
+                                   line_end)]
+            pieces.append(piece.ljust(stop - index, OPEN))
+            index = stop
+        return ''.join(pieces)
+
+class MoveHistory(object):
+    """
+    The moves a player has made since leaving a starting position.
+
+    Each move is stored as a 2-bit direction code (its place in DIRECTIONS),
+    four to a byte, and only the current position is kept, so recording a
+    move, backing up a move and resetting are all O(1). Named checkpoints
+    remember a point in the history to return to; a checkpoint is forgotten
+    once the history is backed up past it.
+    """
+
+    def __init__(self, start=START_POSITION):
+        """
+        Constructs an empty history starting at the position start.
+
+        MoveHistory((int, int)) -> MoveHistory
+        """
+        self._start = start
+        self._position = start
+        self._codes = bytearray()
+        self._moves = 0
+        self._checkpoints = {}
+        # (moves, name) for every checkpoint set, in order of moves
+        self._checkpoint_stack = []
+
+    def get_position(self):
+        """
+        Returns the position reached after every move in the history.
+
+        get_position() -> (int, int)
+        """
+        return self._position
+
+    def move(self, direction):
+        """
+        Records a move in direction from the current position.
+
+        move(str) -> None
+        """
+        delta_row, delta_column = DIRECTION_DELTAS[direction]
+        code = DIRECTIONS.index(direction)
+        byte, shift = self._moves >> 2, (self._moves & 3) * 2
+        if byte == len(self._codes):
+            self._codes.append(0)
+        self._codes[byte] = ((self._codes[byte] & ~(3 << shift))
+                             | (code << shift))
+        self._moves += 1
+
+        row, column = self._position
+        self._position = (row + delta_row, column + delta_column)
+
+    def back(self):
+        """
+        Undoes the last move. Returns False if there was no move to undo,
+        else True.
+
+        back() -> bool
+        """
+        if not self._moves:
+            return False
+
+        self._moves -= 1
+        code = (self._codes[self._moves >> 2] >> ((self._moves & 3) * 2)) & 3
+        row, column = self._position
+        delta_row, delta_column = DIRECTION_DELTAS[DIRECTIONS[code]]
+        self._position = (row - delta_row, column - delta_column)
+
+        self._forget_checkpoints()
+        return True
+
+    def reset(self):
+        """
+        Undoes every move, returning to the starting position.
+
+        reset() -> None
+        """
+        self._moves = 0
+        self._position = self._start
+        self._forget_checkpoints()
+
+    def set_checkpoint(self, name):
+        """
+        Remembers the current point in the history as name.
+
+        set_checkpoint(str) -> None
+        """
+        checkpoint = (self._moves, self._position)
+        self._checkpoints[name] = checkpoint
+        self._checkpoint_stack.append((self._moves, name, checkpoint))
+
+    def restore_checkpoint(self, name):
+        """
+        Backs up the history to the checkpoint called name. Raises KeyError
+        if there is no such checkpoint.
+
+        restore_checkpoint(str) -> None
+        """
+        self._moves, self._position = self._checkpoints[name]
+        self._forget_checkpoints()
+
+    def get_checkpoints(self):
+        """
+        Returns the names of the checkpoints that can be restored.
+
+        get_checkpoints() -> list(str)
+        """
+        return list(self._checkpoints)
+
+    def _forget_checkpoints(self):
+        """
+        Forgets the checkpoints later than the current point in the history.
+        Every checkpoint still set is at or before the current point, so each
+        is set after (and stacked above) the ones before it. Each is popped
+        from the stack once, so this is O(1) amortised.
+
+        _forget_checkpoints() -> None
+        """
+        stack = self._checkpoint_stack
+        while stack and stack[-1][0] > self._moves:
+            moves, name, checkpoint = stack.pop()
+            # name may since have been set again at an earlier point
+            if self._checkpoints.get(name) is checkpoint:
+                del self._checkpoints[name]
+
+    def get_directions(self):
+        """
+        Returns the directions of every move in the history, in order.
+
+        get_directions() -> str
+        """
+        return ''.join(
+            DIRECTIONS[(self._codes[move >> 2] >> ((move & 3) * 2)) & 3]
+            for move in range(self._moves))
+
+    def __len__(self):
+        """
+        Returns the number of positions in the history, including the
+        starting position.
+
+        __len__() -> int
+        """
+        return self._moves + 1
+
+def load_parsed_maze(filename):
+    """
+    Loads a maze from file and parses it into a Maze, or a RaggedMaze if its
+    rows are not all the same length.
+
+    load_parsed_maze(str) -> Maze
+    """
+
+    text = load_maze(filename)
+    if is_rectangular(text):
+        return Maze(text)
+    return RaggedMaze(text)
+
+def load_ragged_maze(filename):
+    """
+    Loads a maze from file whose rows may have different lengths, indexing
+    its rows without padding them.
+
+    load_ragged_maze(str) -> RaggedMaze
+    """
+
+    return RaggedMaze(load_maze(filename))
+
+def load_mapped_maze(filename):
+    """
+    Loads a maze from file by memory-mapping it, without reading it into a
+    string.
+
+    load_mapped_maze(str) -> MappedMaze
+    """
+
+    return MappedMaze(filename)
+
 ##########
 
 
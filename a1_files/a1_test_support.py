@@ -0,0 +1,89 @@
+"""
+Shared scaffolding for the seeded a1 test scripts.
+
+Each script checks a function of a maze string, returning a list of the
+problems it found, on random mazes made by random_maze; run_checks parses
+the --seed and --count options, runs the checks and reports the results.
+"""
+
+import argparse
+import random
+
+from a1_support import *
+
+
+def random_maze(generator, max_size=20, walled=False, letters=BAD_POKEMON):
+    """
+    Returns a random rectangular maze string of up to max_size by max_size
+    squares, with a random density of walls, up to two GOOD_POKEMON and up
+    to four Pokemon from letters.
+
+    If walled, the maze is walled around its edge, at least 3 by 3 squares,
+    with an open START_POSITION. Otherwise it starts and ends with a wall,
+    so that load_maze keeps every square.
+
+    random_maze(random.Random, int, bool, str) -> str
+    """
+    smallest = 3 if walled else 1
+    rows = generator.randint(smallest, max_size)
+    columns = generator.randint(smallest, max_size)
+    walls = generator.random() * 0.5
+    squares = [[WALL if generator.random() < walls else OPEN
+                for column in range(columns)] for row in range(rows)]
+
+    if walled:
+        for row in range(rows):
+            squares[row][0] = squares[row][-1] = WALL
+        squares[0] = [WALL] * columns
+        squares[-1] = [WALL] * columns
+        inside = [(row, column) for row in range(1, rows - 1)
+                  for column in range(1, columns - 1)
+                  if (row, column) != START_POSITION]
+    else:
+        inside = [(row, column) for row in range(rows)
+                  for column in range(columns)][1:-1]
+
+    for letter in [GOOD_POKEMON] * generator.randint(0, 2) \
+            + [generator.choice(letters)
+               for other in range(generator.randint(0, 4))]:
+        if inside:
+            row, column = generator.choice(inside)
+            squares[row][column] = letter
+
+    if walled:
+        row, column = START_POSITION
+        squares[row][column] = OPEN
+    else:
+        squares[0][0] = squares[-1][-1] = WALL
+    return '\n'.join(''.join(line) for line in squares)
+
+
+def run_checks(description, check_maze, count, **maze_options):
+    """
+    Runs check_maze on random mazes (see random_maze, which is passed
+    maze_options), as many as the --count option gives, by default count,
+    from the seed given by --seed. Each maze that fails is printed with its
+    problems, then a summary. Returns the exit status: 1 if any maze failed,
+    else 0.
+
+    run_checks(str, function(str) -> list(str), int, **) -> int
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--count', type=int, default=count,
+                        help="number of random mazes")
+    args = parser.parse_args()
+
+    generator = random.Random(args.seed)
+    failed = 0
+    for number in range(args.count):
+        text = random_maze(generator, **maze_options)
+        errors = check_maze(text)
+        if errors:
+            failed += 1
+            print("maze {}: {}\n{}\n".format(number, ", ".join(errors),
+                                             text))
+
+    print("Checked {} mazes with {} passed/{} failed.".format(
+        args.count, args.count - failed, failed))
+    return 1 if failed else 0
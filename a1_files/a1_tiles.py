@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Tiled, out-of-core storage for a1 mazes too large to hold in memory.
+
+A tile file splits a maze into square tiles of tile_size by tile_size
+squares, stored one after another (row by row of tiles) as the squares'
+characters, with the edges of the last row and column of tiles padded with
+walls. A TiledMaze reads tiles from the file as they are needed and keeps
+only a fixed number of recently used tiles in memory, so a player can roam
+any size of maze with bounded memory. The Pokemon squares are only read
+from the file when they are asked for, and building a tile file spools them
+to temporary files, so neither holds them all in memory.
+
+File layout (little-endian):
+    header (see _HEADER), padded to _TILE_ALIGNMENT bytes
+    tiles            tile_size * tile_size bytes each
+    Pokemon squares  pokemon_count unsigned 64-bit indices (as in the maze
+                     string, see position_to_index)
+    Pokemon letters  pokemon_count bytes
+
+Usage: a1_tiles.py maze_file tile_file [--tile-size N]
+"""
+
+import argparse
+from array import array
+import collections
+import re
+import shutil
+import struct
+import tempfile
+
+from a1_support import *
+
+DEFAULT_TILE_SIZE = 256
+DEFAULT_CACHED_TILES = 64
+
+_MAGIC = b'A1TILE'
+_VERSION = 1
+# magic, version, rows, columns, tile size, number of Pokemon
+_HEADER = struct.Struct('<6sHQQQQ')
+_TILE_ALIGNMENT = 4096
+
+_OPEN_SQUARES = bytearray([1]) * 256
+_OPEN_SQUARES[ord(WALL)] = 0
+_OPEN_SQUARES[ord('\n')] = 0
+
+_POKEMON = re.compile('[^# ]')
+
+
+def _tiles_across(columns, tile_size):
+    """
+    Returns the number of tiles in each row of tiles.
+
+    _tiles_across(int, int) -> int
+    """
+    return (columns + tile_size - 1) // tile_size
+
+
+def build_tiles(maze_filename, tile_filename, tile_size=DEFAULT_TILE_SIZE):
+    """
+    Converts the text maze in the file called maze_filename into a tile file
+    called tile_filename, reading only one row of tiles at a time. Raises
+    ValueError if the maze is empty, not rectangular or has a blank row.
+
+    build_tiles(str, str, int) -> None
+    """
+    pokemon_count = 0
+    columns = None
+    row = 0
+    blank_row = None
+
+    with open(maze_filename, 'r') as source, \
+            open(tile_filename, 'wb') as tiles, \
+            tempfile.TemporaryFile() as indices, \
+            tempfile.TemporaryFile() as letters:
+        tiles.write(bytes(_TILE_ALIGNMENT))
+
+        def write_tile_row(lines):
+            width = _tiles_across(columns, tile_size) * tile_size
+            lines = [line.ljust(width, WALL).encode('ascii')
+                     for line in lines]
+            lines += [WALL.encode('ascii') * width] * (tile_size - len(lines))
+            for start in range(0, width, tile_size):
+                tiles.write(b''.join(line[start:start + tile_size]
+                                     for line in lines))
+
+        lines = []
+        for line in source:
+            line = line.rstrip('\n')
+            if not line.strip():
+                # Leading and trailing blank lines are ignored, as load_maze
+                # strips them
+                if columns is not None and blank_row is None:
+                    blank_row = row
+                continue
+            if blank_row is not None:
+                raise ValueError("row {} is blank".format(blank_row))
+            if columns is None:
+                columns = len(line)
+            elif len(line) != columns:
+                raise ValueError("row {} has {} columns, expected {}".format(
+                    row, len(line), columns))
+
+            found = list(_POKEMON.finditer(line))
+            if found:
+                indices.write(array('Q', [
+                    position_to_index((row, match.start()), columns)
+                    for match in found]))
+                letters.write(''.join(match.group() for match in found)
+                              .encode('ascii'))
+                pokemon_count += len(found)
+            lines.append(line)
+            row += 1
+            if len(lines) == tile_size:
+                write_tile_row(lines)
+                lines = []
+
+        if columns is None:
+            raise ValueError("{} holds no maze".format(maze_filename))
+        if lines:
+            write_tile_row(lines)
+
+        for spool in (indices, letters):
+            spool.seek(0)
+            shutil.copyfileobj(spool, tiles)
+        tiles.seek(0)
+        tiles.write(_HEADER.pack(_MAGIC, _VERSION, row, columns, tile_size,
+                                 pokemon_count))
+
+
+class TiledMaze(Maze):
+    """
+    A Maze read from a tile file through a least recently used cache of
+    tiles. Squares are indexed as in the equivalent maze string (see
+    position_to_index), so it can be used anywhere a Maze can; only
+    whole-maze tables (such as get_legal_table) and get_pokemon read every
+    tile or every Pokemon.
+    """
+
+    def __init__(self, filename, cached_tiles=DEFAULT_CACHED_TILES):
+        """
+        Opens the tile file called filename, keeping up to cached_tiles
+        tiles in memory. Raises ValueError if it is not a tile file.
+
+        TiledMaze(str, int) -> TiledMaze
+        """
+        self._file = open(filename, 'rb')
+        try:
+            (magic, version, self._rows, self._columns, self._tile_size,
+             pokemon_count) = _HEADER.unpack(self._file.read(_HEADER.size))
+        except struct.error:
+            magic = version = None
+        if magic != _MAGIC or version != _VERSION:
+            self._file.close()
+            raise ValueError("{} is not a tile file".format(filename))
+
+        self._across = _tiles_across(self._columns, self._tile_size)
+        down = (self._rows + self._tile_size - 1) // self._tile_size
+        self._tile_bytes = self._tile_size ** 2
+
+        self._pokemon_offset = (_TILE_ALIGNMENT
+                                + down * self._across * self._tile_bytes)
+        self._pokemon_count = pokemon_count
+        self._pokemon = None
+
+        self._cached_tiles = cached_tiles
+        self._tiles = collections.OrderedDict()
+        self._pokemon_order = None
+        self._legal = None
+        self._tables = {}
+
+    def close(self):
+        """
+        Closes the tile file.
+
+        close() -> None
+        """
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _get_tile(self, tile_row, tile_column):
+        """
+        Returns the squares of a tile, reading it from the file unless it is
+        one of the most recently used tiles.
+
+        _get_tile(int, int) -> bytes
+        """
+        key = (tile_row, tile_column)
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+            return tile
+
+        self._file.seek(_TILE_ALIGNMENT + (tile_row * self._across
+                                           + tile_column) * self._tile_bytes)
+        tile = self._file.read(self._tile_bytes)
+        self._tiles[key] = tile
+        if len(self._tiles) > self._cached_tiles:
+            self._tiles.popitem(last=False)
+        return tile
+
+    def _get_square(self, row, column):
+        """
+        Returns the byte value of the square at (row, column).
+
+        _get_square(int, int) -> int
+        """
+        size = self._tile_size
+        tile = self._get_tile(row // size, column // size)
+        return tile[(row % size) * size + column % size]
+
+    def get_pokemon(self):
+        """
+        Returns a dictionary mapping the index of each Pokemon square to the
+        letter of the Pokemon on it. The Pokemon are read from the file on
+        first use.
+
+        get_pokemon() -> dict(int: str)
+        """
+        if self._pokemon is None:
+            self._file.seek(self._pokemon_offset)
+            indices = array('Q')
+            indices.fromfile(self._file, self._pokemon_count)
+            letters = self._file.read(self._pokemon_count).decode('ascii')
+            self._pokemon = dict(zip(indices, letters))
+        return self._pokemon
+
+    def is_wall(self, index):
+        """
+        Returns True iff the square at index cannot be entered.
+
+        is_wall(int) -> bool
+        """
+        row, column = divmod(index, self._columns + 1)
+        if column == self._columns:
+            return True
+        return not _OPEN_SQUARES[self._get_square(row, column)]
+
+    def get_legal_mask(self, index):
+        """
+        Returns the legal direction mask of the square at index (see
+        Maze.get_legal_mask), from the legal direction table if one has been
+        built, else from the tiles around the square.
+
+        get_legal_mask(int) -> int
+        """
+        if self._legal is not None:
+            return self._legal[index]
+        return self._find_legal_mask(index)
+
+    def _open_flags(self):
+        """
+        Returns a byte per index, 1 if the square can be entered, else 0.
+        This reads the whole maze.
+
+        _open_flags() -> bytes
+        """
+        return self.get_text(0, len(self)).encode('ascii') \
+            .translate(_OPEN_SQUARES)
+
+    def __getitem__(self, index):
+        """
+        Returns the character of the square at index, as in the maze string.
+
+        __getitem__(int) -> str
+        """
+        row, column = divmod(index, self._columns + 1)
+        if column == self._columns:
+            return '\n'
+        return chr(self._get_square(row, column))
+
+    def __len__(self):
+        """
+        Returns the length of the equivalent maze string.
+
+        __len__() -> int
+        """
+        return self._rows * (self._columns + 1) - 1
+
+    def __str__(self):
+        """
+        Returns the equivalent maze string. This reads the whole maze.
+
+        __str__() -> str
+        """
+        return self.get_text(0, len(self))
+
+    def get_text(self, start, end):
+        """
+        Returns the part of the maze string from index start up to end.
+
+        get_text(int, int) -> str
+        """
+        columns = self._columns
+        stride = columns + 1
+        size = self._tile_size
+
+        pieces = []
+        index = max(start, 0)
+        end = min(end, len(self))
+        while index < end:
+            row, column = divmod(index, stride)
+            if column == columns:
+                pieces.append(b'\n')
+                index += 1
+                continue
+
+            # The rest of this row within this tile
+            stop = min(end, row * stride + columns,
+                       index + size - column % size)
+            tile = self._get_tile(row // size, column // size)
+            offset = (row % size) * size + column % size
+            pieces.append(tile[offset:offset + stop - index])
+            index = stop
+        return b''.join(pieces).decode('ascii')
+
+
+def load_tiled_maze(filename, cached_tiles=DEFAULT_CACHED_TILES):
+    """
+    Opens the tile file called filename, keeping up to cached_tiles tiles in
+    memory at once.
+
+    load_tiled_maze(str, int) -> TiledMaze
+    """
+    return TiledMaze(filename, cached_tiles)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert an a1 maze file into a tile file.")
+    parser.add_argument('maze_file')
+    parser.add_argument('tile_file')
+    parser.add_argument('--tile-size', type=int, default=DEFAULT_TILE_SIZE)
+    args = parser.parse_args()
+
+    build_tiles(args.maze_file, args.tile_file, args.tile_size)
+
+
+if __name__ == '__main__':
+    main()
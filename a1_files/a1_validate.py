@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Parallel validation of a directory of a1 maze files.
+
+Each maze is checked in a worker process to be rectangular, to have an open
+square at START_POSITION, and to have a safe route to the GOOD_POKEMON. One
+JSON line is printed per maze as soon as its result is ready, in whatever
+order the workers finish.
+
+Usage: a1_validate.py directory [--pattern GLOB] [--workers N]
+"""
+
+import argparse
+import concurrent.futures
+import glob
+import json
+import os
+import sys
+
+from a1_support import *
+from a1_solver import solve
+
+NOT_RECTANGULAR_TEXT = "row {} has {} columns, expected {}"
+START_BLOCKED_TEXT = "start square {} is {!r}, not open"
+NO_ROUTE_TEXT = "no safe route to " + POKEMON[GOOD_POKEMON]
+
+
+def validate_maze(maze):
+    """
+    Returns a list of the problems found with maze, a maze string; an empty
+    list means the maze is valid.
+
+    validate_maze(str) -> list(str)
+    """
+    columns = maze_columns(maze)
+    errors = []
+    for row, line in enumerate(maze.split('\n')):
+        if len(line) != columns:
+            errors.append(NOT_RECTANGULAR_TEXT.format(row, len(line),
+                                                      columns))
+    if errors:
+        # Positions cannot be converted to indices, so nothing else is checked
+        return errors
+
+    row, column = START_POSITION
+    if row >= maze_rows(maze) or column >= columns:
+        square = None
+    else:
+        square = maze[position_to_index(START_POSITION, columns)]
+    if square != OPEN:
+        errors.append(START_BLOCKED_TEXT.format(START_POSITION, square))
+    elif solve(Maze(maze)) is None:
+        errors.append(NO_ROUTE_TEXT)
+    return errors
+
+
+def validate_file(filename):
+    """
+    Validates the maze in the file called filename, returning a dictionary
+    giving the file, whether it is valid and the problems found.
+
+    validate_file(str) -> dict(str: *)
+    """
+    try:
+        errors = validate_maze(load_maze(filename))
+    except (OSError, UnicodeError) as e:
+        errors = [str(e)]
+    return {'file': filename, 'valid': not errors, 'errors': errors}
+
+
+def validate_files(filenames, workers=None):
+    """
+    Validates each of filenames in a pool of worker processes, yielding the
+    result for each file (see validate_file) as soon as it is ready.
+
+    validate_files(list(str), int) -> iter(dict(str: *))
+    """
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        futures = [executor.submit(validate_file, filename)
+                   for filename in filenames]
+        for future in concurrent.futures.as_completed(futures):
+            yield future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validate a directory of a1 maze files in parallel.")
+    parser.add_argument('directory')
+    parser.add_argument('--pattern', default='*.txt',
+                        help="glob pattern of maze files (default *.txt)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="number of worker processes (default: CPUs)")
+    args = parser.parse_args()
+
+    filenames = sorted(glob.glob(os.path.join(args.directory, args.pattern)))
+    invalid = 0
+    for result in validate_files(filenames, args.workers):
+        invalid += not result['valid']
+        print(json.dumps(result), flush=True)
+
+    sys.exit(1 if invalid else 0)
+
+
+if __name__ == '__main__':
+    main()
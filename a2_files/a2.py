@@ -20,6 +20,10 @@ from a2_support import *
 
 # Write your code here
 
+import bisect
+import heapq
+import io
+
 class GameObject(object):
     def __init__(self, name, position):
         """Constructor
@@ -55,12 +59,23 @@ class GameObject(object):
         """
         return self._name
 
+    def _get_cell_position(self):
+        """
+        Returns the position as written in game files (see from_lattice),
+        or None if there is no position.
+        _get_cell_position(self) -> (num, num)
+        """
+        if self._position is None:
+            return None
+        return from_lattice(self._position)
+
     def __str__(self):
         """
         Returns a human readable representation of this instance
         __str___(self) -> str{int, int}
         """
-        return GAME_OBJECT_FORMAT.format(self._name, self._position)
+        return GAME_OBJECT_FORMAT.format(self._name,
+                                         self._get_cell_position())
 
 class Pokemon(GameObject):
     def __init__(self, name, position, terrain):
@@ -89,10 +104,13 @@ class Pokemon(GameObject):
         Returns a human readable representation of this instance.
         __str__(self) -> str{(int, int), str}
         """
-        return POKEMON_FORMAT.format(self._name, self._position, self._terrain)
+        return POKEMON_FORMAT.format(self._name, self._get_cell_position(),
+                                     self._terrain)
 
     def __repr__(self):
-        return POKEMON_REPR_FORMAT.format(self._name, self._position, self._terrain)
+        return POKEMON_REPR_FORMAT.format(self._name,
+                                          self._get_cell_position(),
+                                          self._terrain)
    
 class Player(GameObject):
     def __init__(self, name):
@@ -100,7 +118,7 @@ class Player(GameObject):
         __init__(self, name)
         """
         super().__init__(name, None)
-        self._pokencounter = Dex([])
+        self._pokencounter = BitsetDex([])
         self._pokecaught = []
 
     def get_pokemons(self):
@@ -123,7 +141,7 @@ class Player(GameObject):
         Resets all the Pokemon caught by this Player, including their Dex.
         reset_pokemons(self) -> str
         """
-        self._pokencounter = Dex([])
+        self._pokencounter = BitsetDex([])
         self._pokecaught = []
 
     def register_pokemon(self, pokemon):
@@ -141,7 +159,8 @@ class Player(GameObject):
         Returns a human readable representation of this instance.
         __str__(self) -> str{(int, int), int}
         """
-        return PLAYER_FORMAT.format(self.get_name(), super().get_position(),
+        return PLAYER_FORMAT.format(self.get_name(),
+                                    self._get_cell_position(),
                                     len(self._pokecaught))
 
 
@@ -153,12 +172,46 @@ class Wall(GameObject):
 
 
 class Dex(object):
+    """
+    A record of the pokemon a player expects to find and has registered.
+
+    The registered and unregistered names are kept in sorted lists, updated
+    with bisect as pokemon are expected and registered, so listing them
+    never sorts. Every change bumps a version number, and the listings and
+    string built by the listing methods and __str__ are cached until the
+    next change; each call returns its own copy of a cached listing.
+    """
     def __init__(self, pokemon_names):
         """Constructor
         __init__(self, pokemon_names)"""
         self._dex = {}
+        self._registered_names = []
+        self._unregistered_names = []
+        self._version = 0
+        self._snapshots = {}
+        self._snapshot_version = 0
         self.expect_pokemons(pokemon_names)
 
+    def get_version(self):
+        """
+        Returns a number that changes whenever this Dex changes.
+        get_version(self) -> int
+        """
+        return self._version
+
+    def _snapshot(self, key, build):
+        """
+        Returns the value cached as key for the current version of this Dex,
+        calling build to make it if there is none.
+        _snapshot(self, str, function) -> *
+        """
+        if self._snapshot_version != self._version:
+            self._snapshots = {}
+            self._snapshot_version = self._version
+        if key not in self._snapshots:
+            self._snapshots[key] = build()
+        return self._snapshots[key]
+
     def expect_pokemons(self, pokemon_names):
         """
         Instructs the Dex to also expect all pokemon in the list of
@@ -170,6 +223,8 @@ class Dex(object):
                 continue
             else:
                 self._dex[x] = False
+                bisect.insort(self._unregistered_names, x)
+                self._version += 1
 
     def expect_pokemons_from_dex(self, other_dex):
         """
@@ -182,7 +237,22 @@ class Dex(object):
         for poke in self._pkmlist:
             pokemon_names.append(poke[0])
         self.expect_pokemons(pokemon_names)
-        
+
+    def _set_registered(self, pokemon_name):
+        """
+        Registers the expected pokemon(name), returning True if it was
+        already registered, else False.
+        _set_registered(self, str) -> bool
+        """
+        if self._dex[pokemon_name]:
+            return True
+        self._dex[pokemon_name] = True
+        names = self._unregistered_names
+        del names[bisect.bisect_left(names, pokemon_name)]
+        bisect.insort(self._registered_names, pokemon_name)
+        self._version += 1
+        return False
+
     def register(self, pokemon_name):
         """
         Registers the pokemon(name) in the Dex. Returns True if the pokemon was
@@ -193,13 +263,7 @@ class Dex(object):
         if pokemon_name not in self._dex:
             raise UnexpectedPokemonError(pokemon_name +
                                          ' is not expected by this Dex')
-        elif self._dex[pokemon_name] == False:
-            self._dex[pokemon_name] = True
-            return False
-        else:
-            self._dex[pokemon_name] = True
-            return True
-        
+        return self._set_registered(pokemon_name)
 
     def register_from_dex(self, other_dex):
         """
@@ -208,10 +272,9 @@ class Dex(object):
         never raise an UnexpectedPokemonError.
         register_from_dex(self, list) -> str
         """
-        for pokemon in other_dex._dex:
+        for pokemon in other_dex.get_registered_pokemons():
             if pokemon in self._dex:
-                if other_dex._dex[pokemon] == True:
-                    self._dex[pokemon] = True
+                self._set_registered(pokemon)
 
     def get_pokemons(self):
         """
@@ -221,24 +284,17 @@ class Dex(object):
         alphabetically by name.
         get_pokemon(self) -> list
         """
-        pokecaught = []
-        for pokemon in self._dex:
-            poke = self._dex[pokemon]
-            pokecaught.append((pokemon, poke))
-        return sorted(pokecaught)
-       
+        return list(self._snapshot('pokemons', lambda: list(heapq.merge(
+            [(name, True) for name in self.get_registered_pokemons()],
+            [(name, False) for name in self.get_unregistered_pokemons()]))))
+
     def get_registered_pokemons(self):
         """
         Returns an alphabetically sorted list of names of pokemon registered in
         this Dex.
         get_registered_pokemons(self) -> list
         """
-        pokeregistered = []
-        for pokemon in self._dex:
-            if self._dex[pokemon] == True:
-                pokeregistered.append(pokemon)
-        sorted(pokeregistered)
-        return pokeregistered
+        return list(self._registered_names)
 
     def get_unregistered_pokemons(self):
         """
@@ -246,13 +302,8 @@ class Dex(object):
         unregistered in, but expected by, this Dex.
         get_unregistered_pokemons(self) -> list
         """
-        pokeunregistered = []
-        for pokemon in self._dex:
-            if self._dex[pokemon] == False:
-                pokeunregistered.append(pokemon)
-        sorted(pokeunregistered)
-        return pokeunregistered
-                              
+        return list(self._unregistered_names)
+
     def __len__(self):
         """
         Returns the total number of pokemon expected by this Dex.
@@ -273,42 +324,321 @@ class Dex(object):
         Returns a human readable string representation of this Dex.
         __str__(self) -> str{int}
         """
-        return DEX_FORMAT.format(len(self.get_registered_pokemons()),
-                                 ", ".join(self.get_registered_pokemons()),
-                                 len(self.get_unregistered_pokemons()),
-                                 ", ".join(self.get_unregistered_pokemons()))
+        def build():
+            registered = self.get_registered_pokemons()
+            unregistered = self.get_unregistered_pokemons()
+            return DEX_FORMAT.format(len(registered), ", ".join(registered),
+                                     len(unregistered),
+                                     ", ".join(unregistered))
+        return self._snapshot('str', build)
+
+class DexIndex(object):
+    """
+    Interns pokemon names as bit numbers for BitsetDex. Bits are numbered
+    in alphabetical order of name, so scanning a bitset from its lowest bit
+    lists names sorted, and each name keeps its id from pokemon.txt.
+    """
+    _default = None
+
+    def __init__(self, ids):
+        """Constructor, where ids maps each pokemon name to its id
+        __init__(self, dict{str: int})
+        """
+        self._names = sorted(ids)
+        self._bits = {name: bit for bit, name in enumerate(self._names)}
+        self._ids = dict(ids)
+
+    @classmethod
+    def get_default(cls):
+        """
+        Returns the DexIndex of the pokemon in pokemon.txt, loading it on
+        first use. If the file cannot be read, the index is empty.
+        get_default(cls) -> DexIndex
+        """
+        if cls._default is None:
+            try:
+                ids = load_pokemon_ids()
+            except OSError:
+                ids = {}
+            cls._default = cls(ids)
+        return cls._default
+
+    def get_bit(self, name):
+        """
+        Returns the bit number of the pokemon name, else None.
+        get_bit(self, str) -> int
+        """
+        return self._bits.get(name)
+
+    def get_id(self, name):
+        """
+        Returns the pokemon.txt id of the pokemon name, else None.
+        get_id(self, str) -> int
+        """
+        return self._ids.get(name)
+
+    def get_names(self, bits):
+        """
+        Returns the names of the pokemon whose bits are set in bits, sorted
+        alphabetically.
+        get_names(self, int) -> list
+        """
+        names = []
+        data = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+        for index, byte in enumerate(data):
+            while byte:
+                low = byte & -byte
+                names.append(self._names[index * 8 + low.bit_length() - 1])
+                byte ^= low
+        return names
+
+
+class BitsetDex(Dex):
+    """
+    A Dex storing its expected and registered pokemon as integer bitsets,
+    with bit numbers from a DexIndex. Registering from another BitsetDex
+    with the same index is a bitwise OR. Names missing from the index are
+    kept in a dictionary, as Dex does. Listings are cached until the next
+    change, as for Dex.
+    """
+    def __init__(self, pokemon_names, index=None):
+        """Constructor
+        __init__(self, pokemon_names, DexIndex)"""
+        self._index = DexIndex.get_default() if index is None else index
+        self._expected = 0
+        self._registered = 0
+        self._dex = {}
+        self._version = 0
+        self._snapshots = {}
+        self._snapshot_version = 0
+        self.expect_pokemons(pokemon_names)
+
+    def _shares_index(self, other_dex):
+        """
+        Returns True iff other_dex is a BitsetDex using the same DexIndex.
+        _shares_index(self, Dex) -> bool
+        """
+        return (isinstance(other_dex, BitsetDex)
+                and other_dex._index is self._index)
+
+    def _state(self):
+        """
+        Returns a value that differs whenever the contents of this Dex do.
+        _state(self) -> (int, int, int, int)
+        """
+        return (self._expected, self._registered, len(self._dex),
+                sum(self._dex.values()))
+
+    def _update_version(self, state):
+        """
+        Bumps the version if the contents of this Dex have changed from
+        state (as returned by _state).
+        _update_version(self, tuple) -> None
+        """
+        if self._state() != state:
+            self._version += 1
+
+    def expect_pokemons(self, pokemon_names):
+        """
+        Instructs the Dex to also expect all pokemon in the list of
+        pokemon_names (that are not already expected).
+        expect_pokemons(self, list) -> None
+        """
+        state = self._state()
+        for name in pokemon_names:
+            bit = self._index.get_bit(name)
+            if bit is None:
+                self._dex.setdefault(name, False)
+            else:
+                self._expected |= 1 << bit
+        self._update_version(state)
+
+    def expect_pokemons_from_dex(self, other_dex):
+        """
+        Instruct the Dex to also expect all pokemon that other_dex expects
+        (that are not already expected)
+        expect_pokemons_from_dex(self, Dex) -> None
+        """
+        if self._shares_index(other_dex):
+            state = self._state()
+            self._expected |= other_dex._expected
+            for name in other_dex._dex:
+                self._dex.setdefault(name, False)
+            self._update_version(state)
+        else:
+            self.expect_pokemons(name for name, registered
+                                 in other_dex.get_pokemons())
+
+    def _set_registered(self, pokemon_name):
+        """
+        Registers the expected pokemon(name), returning True if it was
+        already registered, else False.
+        _set_registered(self, str) -> bool
+        """
+        bit = self._index.get_bit(pokemon_name)
+        if bit is None or not self._expected >> bit & 1:
+            # Kept in the dictionary
+            if self._dex[pokemon_name]:
+                return True
+            self._dex[pokemon_name] = True
+        else:
+            if self._registered >> bit & 1:
+                return True
+            self._registered |= 1 << bit
+        self._version += 1
+        return False
+
+    def register(self, pokemon_name):
+        """
+        Registers the pokemon(name) in the Dex. Returns True if the pokemon was
+        already registered, else False. This method raises an
+        UnexpectedPokemonError if the pokemon is not expected by this Dex.
+        register(self, str) -> bool
+        """
+        bit = self._index.get_bit(pokemon_name)
+        if bit is None or not self._expected >> bit & 1:
+            return super().register(pokemon_name)
+        return self._set_registered(pokemon_name)
+
+    def register_from_dex(self, other_dex):
+        """
+        Registers each pokemon from the another Dex, other_dex, provided it is
+        expected by this Dex and registered in the other Dex. This method must
+        never raise an UnexpectedPokemonError.
+        register_from_dex(self, Dex) -> None
+        """
+        if not self._shares_index(other_dex):
+            for name in other_dex.get_registered_pokemons():
+                bit = self._index.get_bit(name)
+                if name in self._dex or (bit is not None
+                                         and self._expected >> bit & 1):
+                    self._set_registered(name)
+            return
+
+        state = self._state()
+        self._registered |= other_dex._registered & self._expected
+        for name, registered in other_dex._dex.items():
+            if registered and name in self._dex:
+                self._dex[name] = True
+        self._update_version(state)
+
+    def _merge(self, names, registered):
+        """
+        Returns names (sorted) merged with the names outside the index whose
+        registered flag is registered, in alphabetical order.
+        _merge(self, list, bool) -> list
+        """
+        extra = [name for name, flag in self._dex.items()
+                 if flag == registered]
+        if not extra:
+            return names
+        return sorted(names + extra)
+
+    def get_registered_pokemons(self):
+        """
+        Returns an alphabetically sorted list of names of pokemon registered in
+        this Dex.
+        get_registered_pokemons(self) -> list
+        """
+        return list(self._snapshot('registered', lambda: self._merge(
+            self._index.get_names(self._registered), True)))
+
+    def get_unregistered_pokemons(self):
+        """
+        Returns an alphabetically sorted list of names of pokemon
+        unregistered in, but expected by, this Dex.
+        get_unregistered_pokemons(self) -> list
+        """
+        return list(self._snapshot('unregistered', lambda: self._merge(
+            self._index.get_names(self._expected & ~self._registered),
+            False)))
+
+    def __len__(self):
+        """
+        Returns the total number of pokemon expected by this Dex.
+        __len__(self) -> int
+        """
+        return bin(self._expected).count('1') + len(self._dex)
+
+    def __contains__(self, name):
+        """
+        Returns True iff pokemon with name is registered in this Dex, else
+        False.
+        __contains__(self, name) -> bool
+        """
+        bit = self._index.get_bit(name)
+        if bit is None:
+            return self._dex.get(name, False)
+        return bool(self._registered >> bit & 1)
+
 
 class Level(object):
     def __init__(self, player, data):
         """Constructor
         __init__(self, Player, data)"""
         self._player = player
-        self._data = data
-        self._wall = {}
         self._poke = {}
         poke = []
-        self._lvldex=Dex([])
-        for var in self._data.get('pokemons'):
+        self._lvldex = BitsetDex([])
+        for var in data.get('pokemons'):
             position = var.get('position')
             pokemon = var.get('name')
             self._poke[position] = Pokemon(pokemon, position,
-                                           self._data.get('terrain'))
+                                           data.get('terrain'))
             poke.append(pokemon)
         self._player.get_dex().expect_pokemons(poke)
         self._lvldex.expect_pokemons(poke)
-        for var in self._data.get('walls'):
-            position = var
-            self._wall[position] = None
-        rows = self._data.get('rows')
-        columns = self._data.get('columns')
-        for row in range(0, rows):
-            self._wall[(row, -0.5)] = None 
-            self._wall[(row, columns - 0.5)] = None 
-        for column in range(0, columns):
-            self._wall[(-0.5, column)] = None 
-            self._wall[(rows-0.5, column)] = None 
-            
-        
+        # Walls are kept as one bit per edge between neighbouring cells:
+        # bit row * columns + column of _horizontal_walls is the edge below
+        # (row, column), and bit row * (columns - 1) + column of
+        # _vertical_walls is the edge right of it. Edges on the boundary
+        # are always walls, so they are not stored.
+        self._rows = data.get('rows')
+        self._columns = data.get('columns')
+        self._horizontal_walls = bytearray(
+            (max(self._rows - 1, 0) * self._columns + 7) // 8)
+        self._vertical_walls = bytearray(
+            (self._rows * max(self._columns - 1, 0) + 7) // 8)
+        for position in data.get('walls'):
+            edge = self._find_edge(position)
+            if edge is not None and edge[0] is not None:
+                grid, bit = edge
+                grid[bit >> 3] |= 1 << (bit & 7)
+        # Only what the getters need is kept, not the list of walls
+        self._data = {key: data.get(key)
+                      for key in ('rows', 'columns', 'terrain', 'player')}
+
+    def _find_edge(self, position):
+        """
+        Returns the (grid, bit) pair of the edge at the lattice position of a
+        wall, where grid is None for an edge on the boundary, or None if
+        position is not an edge within or around the grid.
+        _find_edge(self, (int, int)) -> (bytearray, int)
+        """
+        row, column = position
+        if row % 1 or column % 1:
+            return None
+        row, column = int(row), int(column)
+        rows, columns = self._rows, self._columns
+
+        if row % 2 and not column % 2:
+            # Horizontal wall, below the cell (top, column)
+            top, column = (row - 1) // 2, column // 2
+            if not 0 <= column < columns or not -1 <= top < rows:
+                return None
+            if top == -1 or top == rows - 1:
+                return None, -1
+            return self._horizontal_walls, top * columns + column
+        if column % 2 and not row % 2:
+            # Vertical wall, right of the cell (row, left)
+            row, left = row // 2, (column - 1) // 2
+            if not 0 <= row < rows or not -1 <= left < columns:
+                return None
+            if left == -1 or left == columns - 1:
+                return None, -1
+            return self._vertical_walls, row * (columns - 1) + left
+        return None
+
     def get_size(self):
         """
         Returns the size of the level grid.
@@ -335,7 +665,8 @@ class Level(object):
     
     def get_starting_position(self):
         """
-        Returns the player's starting position for this level.
+        Returns the player's starting position for this level, as a lattice
+        position (see to_lattice).
         get_starting_position(self) -> (int, int)
         """
         position = self._data.get('player')
@@ -343,21 +674,45 @@ class Level(object):
 
     def is_obstacle_at(self, position):
         """
-        Returns True iff an obstacle exists at given position, else False.
+        Returns True iff an obstacle exists at given lattice position, else
+        False.
         is_obstacle_at(self, position) -> (int, int)
         """
-        if position in list(self._wall.keys()):
-            return True
-        else:
+        edge = self._find_edge(position)
+        if edge is None:
             return False
+        grid, bit = edge
+        if grid is None:
+            return True
+        return bool(grid[bit >> 3] >> (bit & 7) & 1)
 
     def get_obstacles(self):
         """
-        Returns a list of positions of all obstacles (walls) that exist in
-        this level, including boundary walls.
+        Returns a list of lattice positions of all obstacles (walls) that
+        exist in this level, including boundary walls.
         get_obstacles(self) -> list
         """
-        return list(self._wall.keys())
+        rows, columns = self._rows, self._columns
+        obstacles = []
+        for grid, width, wall_position in (
+                (self._horizontal_walls, columns,
+                 lambda row, column: (2 * row + 1, 2 * column)),
+                (self._vertical_walls, columns - 1,
+                 lambda row, column: (2 * row, 2 * column + 1))):
+            for index, byte in enumerate(grid):
+                while byte:
+                    low = byte & -byte
+                    bit = index * 8 + low.bit_length() - 1
+                    obstacles.append(wall_position(*divmod(bit, width)))
+                    byte ^= low
+
+        for row in range(0, 2 * rows, 2):
+            obstacles.append((row, -1))
+            obstacles.append((row, 2 * columns - 1))
+        for column in range(0, 2 * columns, 2):
+            obstacles.append((-1, column))
+            obstacles.append((2 * rows - 1, column))
+        return obstacles
     
     def get_pokemons(self):
         """
@@ -374,10 +729,7 @@ class Level(object):
         Returns the Pokemon that exists at the given position, else None.
         get_pokemon_at(self, (int, int)) -> Pokemon
         """
-        if position in list(self._poke.keys()):
-            return self._poke.get(position)
-        else:
-            return None
+        return self._poke.get(position)
 
 
     def catch_pokemon_at(self, position):
@@ -407,56 +759,97 @@ class Level(object):
 
 
 class Game(object):
+    """
+    A game of levels read from a game file. Levels are read from the file
+    and constructed one at a time, as start_next_level reaches them, so
+    only the current level and the data for the next are held at once.
+    The game file is therefore kept open until its last level has been
+    read, or another game is loaded.
+    """
     def __init__(self):
         """Constructor
         __init__()"""
 
         self._player = Player(DEFAULT_PLAYER_NAME)
-        self._levels = []
-        self._game_data = {}
+        self._open_game = None
+        self._level_data = None
+        self._next_level_data = None
+        self._level_error = None
+        self._level_count = 0
         self._currentlvl ={}
-##        self._lvldex = Level(self._player, self._currentlvl).get_dex()
-        
+
+    def _load_levels(self, open_game):
+        """
+        Starts reading levels from the game file returned by calling
+        open_game, reading ahead to the first level so that a missing or
+        invalid file is reported straight away. If it is, the game loaded
+        before is left as it was.
+        _load_levels(self, function) -> None
+        """
+        level_data = self._stream_levels(open_game)
+        next_level_data = next(level_data, None)
+
+        if self._level_data is not None:
+            self._level_data.close()
+        self._open_game = open_game
+        self._level_data = level_data
+        self._next_level_data = next_level_data
+        self._level_error = None
+        self._level_count = None
+        self._currentlvl = None
+
+    def _stream_levels(self, open_game):
+        """
+        Yields the data for each level of the game file returned by calling
+        open_game, in turn. The file is closed once the last level is read,
+        or when the generator is closed by loading another game.
+        _stream_levels(self, function) -> iter(dict)
+        """
+        with open_game() as game:
+            yield from iter_game_levels(game)
+
     def load_file(self, game_file):
         """
-        Loads a game from a file, given by game_file, using load_game_file
-        from the support file.
+        Loads a game from a file, given by game_file. Levels are read from
+        the file as they are started.
         load_file(self, str) -> file
         """
-        self._game_data = load_game_file(game_file)
-        self._currentlvl = None
-        for level_data in self._game_data['levels']:
-                level = Level(self._player, level_data)
-                self._levels.append(level)
+        self._load_levels(lambda: open_game_file(game_file))
 
     def load_url(self, game_url):
         """
-        Loads a game from url, given by game_url, using load_game_url from
+        Loads a game from url, given by game_url, using fetch_game_url from
         the support file.
         load_game_url(str) -> file
         """
-        self._game_data = load_game_url(game_url)
-        self._currentlvl = None
-        for level_data in self._game_data['levels']:
-                level = Level(self._player, level_data)
-                self._levels.append(level)
+        text = fetch_game_url(game_url)
+        self._load_levels(lambda: io.StringIO(text))
         
     def start_next_level(self): 
         """
         Attempts to start the next level of the game. Return True iff
         the game is completed, else False. This method should raise an
         InvalidPositionError if the level contains any invalid positions.
+        The level after it is read ahead from the game file; if that level
+        is invalid, InvalidGameDataError is raised whenever it would be
+        started, and the game cannot be completed.
         start_next_level(self) -> str
         """
-        if len(self._levels) == 0 and self.get_level().is_complete():
+        if self._level_error is not None:
+            raise self._level_error
+        if self._next_level_data is None and self.get_level().is_complete():
             return True
         else:
-            self._currentlvl = self._levels.pop(0)
-##            self._currentlvl.register_from_dex(self._player.get_dex())
-##            self._player.get_dex().expect_pokemons(self._lvldex)
-##            self._player.register_pokemon(self._lvldex)
-
+            if self._next_level_data is None:
+                raise IndexError("no levels remain")
+            self._currentlvl = Level(self._player, self._next_level_data)
             self._player.set_position(self.get_level().get_starting_position())
+
+            self._next_level_data = None
+            try:
+                self._next_level_data = next(self._level_data, None)
+            except InvalidGameDataError as error:
+                self._level_error = error
             return False
 
     def get_player(self):
@@ -476,17 +869,22 @@ class Game(object):
                     
     def __len__(self):
         """
-        Returns the total number of levels in the game.
+        Returns the total number of levels in the game, counted the first
+        time it is asked for by scanning the game file without decoding or
+        constructing its levels (see count_game_levels).
         __len__(self) -> int
         """
-        return len(self._game_data['levels'])
+        if self._level_count is None:
+            with self._open_game() as game:
+                self._level_count = count_game_levels(game)
+        return self._level_count
 
     def is_complete(self):
         """
         Returns True iff no level remain incomplete, else False.
         is_complete(self) -> str
         """
-        if len(self._levels) == 0:
+        if self._next_level_data is None and self._level_error is None:
             return True
         else:
             return False
@@ -510,9 +908,9 @@ class Game(object):
             directionx, directiony = DIRECTION_WALL_DELTAS.get(direction)
             newpos = (x+directionx, y+directiony)
                ## check for the wall:
-            if newpos in self._currentlvl.get_obstacles():
+            if self._currentlvl.is_obstacle_at(newpos):
                 return Wall(self._player, newpos)
-            elif newpos not in self._currentlvl.get_obstacles():
+            else:
                 ## move
                 x1, y1 = newpos
                 newpos1 = (x1+directionx, y1+directiony)
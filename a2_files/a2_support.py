@@ -1,6 +1,8 @@
 # VERSION 1.0.4
 
 import json
+import os
+import re
 import urllib.request
 
 # Some useful constants
@@ -13,6 +15,10 @@ DIRECTIONS = [NORTH, SOUTH, EAST, WEST]
 
 DEFAULT_PLAYER_NAME = "Ash"
 
+# File of pokemon ids and names, one "id name" pair per line
+POKEMON_NAME_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 "pokemon.txt")
+
 DIRECTION_DELTAS = {
     NORTH: (-1, 0),
     EAST: (0, 1),
@@ -20,13 +26,31 @@ DIRECTION_DELTAS = {
     WEST: (0, -1)
 }
 
+# Game positions are kept on a doubled lattice of integers: the cell at
+# (row, column) is at (2 * row, 2 * column), and the wall between two cells
+# is at the point halfway between them, so a wall position has exactly one
+# odd coordinate. Game files and the GUI use (row, column) cells and
+# half-cell walls; see to_lattice and from_lattice.
+
+# Lattice deltas from a cell to the wall beside it in each direction
 DIRECTION_WALL_DELTAS = {
-    NORTH: (-0.5, 0),
-    EAST: (0, 0.5),
-    SOUTH: (0.5, 0),
-    WEST: (0, -0.5)
+    NORTH: (-1, 0),
+    EAST: (0, 1),
+    SOUTH: (1, 0),
+    WEST: (0, -1)
 }
 
+# Characters read from a game file at once when streaming its levels
+GAME_CHUNK_SIZE = 1 << 16
+
+_JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# The parts of a JSON value that matter when skipping over it: whole
+# strings, whole arrays of plain values (such as positions), brackets, and a
+# lone quote for a string cut off by the buffer
+_JSON_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|\[[^"\[\]{}]*\]|[\[\]{}]|"',
+                         re.DOTALL)
+_JSON_SCALAR = re.compile(r'[^ \t\n\r,:\[\]{}"]*')
+
 GAME_OBJECT_FORMAT = "{} @ {}"
 POKEMON_FORMAT = "{} @ {} from {}"
 PLAYER_FORMAT = "{} @ {} has caught {}"
@@ -58,47 +82,77 @@ class InvalidGameDataError(Exception):
     pass
 
 
+def to_lattice(position):
+    """
+    Returns the lattice position of a (row, column) position, where walls
+    are at half-cell offsets such as (0.5, 1).
+
+    Raises:
+        InvalidGameDataError: If position is not made of whole and half
+                              numbers.
+
+    to_lattice((num, num)) -> (int, int)
+    """
+    row, column = position
+    row, column = row * 2, column * 2
+    if row % 1 or column % 1:
+        raise InvalidGameDataError(
+            "Not a cell or wall position: {!r}".format(position))
+    return int(row), int(column)
+
+
+def from_lattice(position):
+    """
+    Returns the (row, column) position of a lattice position, with whole
+    numbers for cells and half-cell offsets for walls.
+
+    from_lattice((int, int)) -> (num, num)
+    """
+    return tuple(value / 2 if value % 2 else value // 2
+                 for value in position)
+
+
 def is_position_valid(position, grid_size):
     """
-    Returns True iff position is a valid position for a grid of grid_size.
+    Returns True iff the lattice position is a valid position for a grid of
+    grid_size (rows, columns), including walls on its boundary.
 
-    is_position_valid((num, num), (int, int)) -> bool
+    is_position_valid((int, int), (int, int)) -> bool
     """
     row, column = position
     rows, columns = grid_size
 
-    return -1 < row < rows and -1 < column < columns
+    return -2 < row < 2 * rows and -2 < column < 2 * columns
 
 
 def is_wall_position_valid(position, grid_size):
     """
-    Returns True iff position is a valid wall position for a grid of grid_size.
+    Returns True iff the lattice position is a valid wall position for a
+    grid of grid_size.
 
-    is_wall_position_valid((num, num), (int, int)) -> bool
+    is_wall_position_valid((int, int), (int, int)) -> bool
     """
     row, column = position
 
     if not is_position_valid(position, grid_size):
         return False
 
-    is_horizontal_wall = round(row % 1 - 0.5) == 0 and column % 1 == 0
-    is_vertical_wall = round(column % 1 - 0.5) == 0 and row % 1 == 0
-
-    # ^ is exclusive or, i.e. either a or b, but not both
-    return is_horizontal_wall ^ is_vertical_wall
+    # A wall lies between two cells, so exactly one coordinate is odd
+    return (row + column) % 2 == 1
 
 def is_cell_position_valid(position, grid_size):
     """
-    Returns True iff position is a valid cell position for a grid of grid_size.
+    Returns True iff the lattice position is a valid cell position for a
+    grid of grid_size.
 
-    is_cell_position_valid((num, num), (int, int)) -> bool
+    is_cell_position_valid((int, int), (int, int)) -> bool
     """
     row, column = position
 
     if not is_position_valid(position, grid_size):
         return False
 
-    return row % 1 == 0 and column % 1 == 0
+    return row % 2 == 0 and column % 2 == 0
 
 
 def euclidean_distance(a, b):
@@ -114,9 +168,50 @@ def euclidean_distance(a, b):
     return ((ax - bx) ** 2 + (ay - by) ** 2) ** 0.5
 
 
+def load_pokemon_ids(name_file=POKEMON_NAME_FILE):
+    """
+    Loads the id of each pokemon from name_file, in the format of
+    pokemon.txt.
+
+    load_pokemon_ids(str) -> dict{str: int}
+    """
+    ids = {}
+    with open(name_file, 'r', encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                id, name = line.split(' ', 1)
+                ids[name] = int(id)
+    return ids
+
+
+def parse_level_data(level):
+    """
+    Converts the positions in the data for one level, as read from a game
+    file, to lattice positions (see to_lattice), in place.
+
+    Raises:
+        InvalidGameDataError: If level data is invalid.
+
+    parse_level_data(dict{str: *}) -> dict{str: *}
+    """
+    try:
+        for pokemon in level['pokemons']:
+            pokemon['position'] = to_lattice(pokemon['position'])
+
+        level['walls'] = [to_lattice(wall) for wall in level['walls']]
+
+        level['player'] = to_lattice(level['player'])
+
+        return level
+    except Exception as e:
+        raise InvalidGameDataError(str(e))
+
+
 def parse_game_text(text):
     """
-    Parses raw json string for game data into Python dictionary
+    Parses raw json string for game data into Python dictionary, with every
+    position converted to a lattice position (see to_lattice)
 
     Raises:
         InvalidGameDataError: If game data is invalid.
@@ -129,19 +224,238 @@ def parse_game_text(text):
         raise InvalidGameDataError(str(e))
 
     try:
-        # transform relevant lists to tuples
-        # not overly necessary, but more meaningful
-        for level in data['levels']:
-            for pokemon in level['pokemons']:
-                pokemon['position'] = tuple(pokemon['position'])
+        levels = data['levels']
+    except Exception as e:
+        raise InvalidGameDataError(str(e))
+    for level in levels:
+        parse_level_data(level)
+    return data
 
-            level['walls'] = [tuple(wall) for wall in level['walls']]
 
-            level['player'] = tuple(level['player'])
+class JSONStream(object):
+    """
+    Reads JSON values one at a time from a text file, through a buffer that
+    only needs to hold the value being read.
+    """
+
+    def __init__(self, file, chunk_size=GAME_CHUNK_SIZE):
+        """
+        Constructor
+
+        JSONStream.__init__(JSONStream, file, int)
+        """
+        self._file = file
+        self._chunk_size = chunk_size
+        self._buffer = ''
+        self._position = 0
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size):
+        """
+        Reads up to size more characters into the buffer, dropping what has
+        already been read. Returns False at the end of the file.
+
+        JSONStream._fill(JSONStream, int) -> bool
+        """
+        chunk = self._file.read(size)
+        if not chunk:
+            return False
+        self._buffer = self._buffer[self._position:] + chunk
+        self._position = 0
+        return True
+
+    def peek(self):
+        """
+        Returns the next character other than whitespace, without reading
+        it, or '' at the end of the file.
+
+        JSONStream.peek(JSONStream) -> str
+        """
+        while True:
+            self._position = _JSON_WHITESPACE.match(self._buffer,
+                                                    self._position).end()
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill(self._chunk_size):
+                return ''
+
+    def expect(self, character):
+        """
+        Reads the next character other than whitespace, which must be
+        character.
+
+        Raises:
+            InvalidGameDataError: If it is any other character.
+
+        JSONStream.expect(JSONStream, str) -> None
+        """
+        found = self.peek()
+        if found != character:
+            raise InvalidGameDataError("Expecting {!r}, found {!r}".format(
+                character, found))
+        self._position += 1
+
+    def read_value(self):
+        """
+        Reads and returns the next JSON value.
+
+        Raises:
+            InvalidGameDataError: If it is not valid JSON.
+
+        JSONStream.read_value(JSONStream) -> *
+        """
+        self.peek()
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer,
+                                                      self._position)
+            except json.decoder.JSONDecodeError as e:
+                # The value may just be cut off at the end of the buffer
+                if not self._fill(size):
+                    raise InvalidGameDataError(str(e))
+                size *= 2
+                continue
+
+            # A number running to the end of the buffer may continue in the
+            # file, even if only part of it was decoded (as 1 from "1.")
+            scalar_end = _JSON_SCALAR.match(self._buffer, self._position).end()
+            if scalar_end == len(self._buffer) and self._fill(size):
+                continue
+            self._position = end
+            return value
+
+    def skip_value(self):
+        """
+        Reads past the next JSON value without decoding it. Only its strings
+        and nesting are followed, so no objects are built, but a value that
+        is not valid JSON may go unnoticed.
+
+        Raises:
+            InvalidGameDataError: If the file ends before the value does.
+
+        JSONStream.skip_value(JSONStream) -> None
+        """
+        first = self.peek()
+        if not first:
+            raise InvalidGameDataError("Expecting value, found ''")
+        if first not in '"[{':
+            # A number, true, false or null
+            while True:
+                end = _JSON_SCALAR.match(self._buffer, self._position).end()
+                if end < len(self._buffer):
+                    break
+                if not self._fill(self._chunk_size):
+                    end = len(self._buffer)
+                    break
+            if end == self._position:
+                raise InvalidGameDataError(
+                    "Expecting value, found {!r}".format(first))
+            self._position = end
+            return
+
+        depth = 0
+        while True:
+            for match in _JSON_TOKEN.finditer(self._buffer, self._position):
+                token = match.group()
+                if token == '"':
+                    # A string cut off at the end of the buffer
+                    self._position = match.start()
+                    break
+                if token == '[' or token == '{':
+                    depth += 1
+                elif token == ']' or token == '}':
+                    depth -= 1
+                if depth == 0:
+                    self._position = match.end()
+                    return
+            else:
+                self._position = len(self._buffer)
+            if not self._fill(self._chunk_size):
+                raise InvalidGameDataError("Unterminated JSON value")
+
+
+def _iter_level_values(file, chunk_size=GAME_CHUNK_SIZE, decode=True):
+    """
+    Yields the data for each level in a game file as it is read, without
+    converting its positions. If decode is False, the levels are only
+    skipped over, and None is yielded for each.
+
+    Raises:
+        InvalidGameDataError: If file does not have valid game data.
+
+    _iter_level_values(file, int, bool) -> iter(dict{str: *})
+    """
+    stream = JSONStream(file, chunk_size)
+    stream.expect('{')
+    if stream.peek() == '}':
+        raise InvalidGameDataError(repr('levels'))
+    while True:
+        key = stream.read_value()
+        stream.expect(':')
+        if key == 'levels':
+            break
+        stream.skip_value()
+        if stream.peek() == '}':
+            raise InvalidGameDataError(repr('levels'))
+        stream.expect(',')
+
+    stream.expect('[')
+    if stream.peek() == ']':
+        return
+    while True:
+        if decode:
+            yield stream.read_value()
+        else:
+            stream.skip_value()
+            yield None
+        if stream.peek() == ']':
+            return
+        stream.expect(',')
+
+
+def iter_game_levels(file, chunk_size=GAME_CHUNK_SIZE):
+    """
+    Yields the data for each level in a game file, as parse_level_data
+    returns it, reading only as much of file as is needed for each level.
+
+    Raises:
+        InvalidGameDataError: If file does not have valid game data.
+
+    iter_game_levels(file, int) -> iter(dict{str: *})
+    """
+    for level in _iter_level_values(file, chunk_size):
+        yield parse_level_data(level)
+
+
+def count_game_levels(file, chunk_size=GAME_CHUNK_SIZE):
+    """
+    Returns the number of levels in a game file, by scanning over each level
+    without decoding it (see JSONStream.skip_value).
+
+    Raises:
+        InvalidGameDataError: If file does not have valid game data.
+
+    count_game_levels(file, int) -> int
+    """
+    return sum(1 for level in _iter_level_values(file, chunk_size, False))
+
+
+def open_game_file(game_file):
+    """
+    Opens a local game file for reading.
+
+    Raises:
+        InvalidGameFileError: If filepath is invalid.
+
+    open_game_file(str) -> file
+    """
+
+    try:
+        return open(game_file, 'r', encoding="utf-8")
+    except FileNotFoundError as e:
+        raise InvalidGameFileError(str(e))
 
-        return data
-    except Exception as e:
-        raise InvalidGameDataError(str(e))
 
 def load_game_file(game_file):
     """
@@ -154,14 +468,27 @@ def load_game_file(game_file):
     load_game_file(str) -> dict
     """
 
+    with open_game_file(game_file) as f:
+        return parse_game_text(f.read())
+
+
+def fetch_game_url(game_url):
+    """
+    Returns the text of a game file via remote url.
+
+    Raises:
+        InvalidGameFileError: If url is invalid.
+
+    fetch_game_url(str) -> str
+    """
+
     try:
-        with open(game_file, 'r', encoding="utf-8") as f:
-            return parse_game_text(f.read())
-    except FileNotFoundError as e:
+        with urllib.request.urlopen(game_url) as f:
+            return f.read().decode('utf-8')
+    except urllib.error.HTTPError as e:
         raise InvalidGameFileError(str(e))
 
 
-
 def load_game_url(game_url):
     """
     Loads game data from file via remote url.
@@ -173,8 +500,4 @@ def load_game_url(game_url):
     load_game_url(str) -> dict
     """
 
-    try:
-        with urllib.request.urlopen(game_url) as f:
-            return parse_game_text(f.read().decode('utf-8'))
-    except urllib.error.HTTPError as e:
-        raise InvalidGameFileError(str(e))
+    return parse_game_text(fetch_game_url(game_url))
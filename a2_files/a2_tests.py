@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Seeded checks for reading game files and for the Dex.
+
+Random game files, with extra keys of awkward JSON around their levels, are
+read with JSONStream at several chunk sizes, so that values are cut at every
+kind of boundary, and must agree with json.loads; count_game_levels must
+count their levels. Each game is then played through Game, level by level,
+and again with an invalid level part way through. The listings of Dex and
+BitsetDex must be sorted and unaffected by changes to lists they returned.
+
+Usage: a2_tests.py [--seed N] [--count N]
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+
+from a2 import *
+
+# Chunk sizes streams are read with, small ones cutting values everywhere
+CHUNK_SIZES = (1, 2, 3, 7, 64, GAME_CHUNK_SIZE)
+TERRAINS = ('Grass', 'Ice', 'Water', 'Fire')
+# Characters strings in random JSON values are made of
+STRING_CHARACTERS = 'ab "\\/[]{}:,\n\té☃'
+# A name that is never in pokemon.txt
+UNKNOWN_NAME = 'Missingno'
+
+
+def random_value(generator, depth=3):
+    """
+    Returns a random JSON value, nested at most depth deep.
+
+    random_value(random.Random, int) -> *
+    """
+    kind = generator.randrange(7 if depth else 5)
+    if kind == 0:
+        return generator.randint(-10 ** 12, 10 ** 12)
+    if kind == 1:
+        return generator.uniform(-1e6, 1e6) * 10 ** generator.randint(-9, 9)
+    if kind == 2:
+        return ''.join(generator.choice(STRING_CHARACTERS)
+                       for length in range(generator.randint(0, 12)))
+    if kind == 3:
+        return generator.choice([True, False])
+    if kind == 4:
+        return None
+    if kind == 5:
+        return [random_value(generator, depth - 1)
+                for item in range(generator.randint(0, 4))]
+    return {''.join(generator.choice(STRING_CHARACTERS)
+                    for length in range(generator.randint(0, 6))):
+            random_value(generator, depth - 1)
+            for item in range(generator.randint(0, 4))}
+
+
+def random_level(generator, names):
+    """
+    Returns the data for a random level of up to 8 by 8 cells, as written in
+    game files, with Pokemon named from names.
+
+    random_level(random.Random, list(str)) -> dict{str: *}
+    """
+    rows = generator.randint(1, 8)
+    columns = generator.randint(1, 8)
+    cells = [[row, column] for row in range(rows)
+             for column in range(columns)]
+    generator.shuffle(cells)
+    walls = []
+    for wall in range(generator.randint(0, rows * columns)):
+        row = generator.randint(-1, rows - 1)
+        column = generator.randint(0, columns - 1)
+        wall = [row + 0.5, column]
+        walls.append(wall if generator.random() < 0.5 else wall[::-1])
+    return {
+        'terrain': generator.choice(TERRAINS),
+        'rows': rows,
+        'columns': columns,
+        'player': cells[0],
+        'pokemons': [{'name': generator.choice(names), 'position': cell}
+                     for cell in cells[1:generator.randint(1, 5)]],
+        'walls': walls,
+    }
+
+
+def random_game(generator, names):
+    """
+    Returns the text of a random game file with one to five levels, and
+    extra keys of random JSON values before and after them.
+
+    random_game(random.Random, list(str)) -> str
+    """
+    game = {}
+    for key in range(generator.randint(0, 3)):
+        game['before{}'.format(key)] = random_value(generator)
+    game['levels'] = [random_level(generator, names)
+                      for level in range(generator.randint(1, 5))]
+    for key in range(generator.randint(0, 3)):
+        game['after{}'.format(key)] = random_value(generator)
+    return json.dumps(game, indent=generator.choice([None, 0, 2]),
+                      ensure_ascii=generator.random() < 0.5)
+
+
+def check_stream(text):
+    """
+    Returns a list of the problems found reading text, the text of a game
+    file, with JSONStream at each of CHUNK_SIZES.
+
+    check_stream(str) -> list(str)
+    """
+    errors = []
+    game = json.loads(text)
+    expected = [parse_level_data(level)
+                for level in json.loads(text)['levels']]
+    for chunk_size in CHUNK_SIZES:
+        levels = list(iter_game_levels(io.StringIO(text), chunk_size))
+        if levels != expected:
+            errors.append("iter_game_levels differs at chunk size {}".format(
+                chunk_size))
+        if count_game_levels(io.StringIO(text), chunk_size) != len(expected):
+            errors.append("count_game_levels differs at chunk size {}".format(
+                chunk_size))
+
+        for value in game.values():
+            value_text = json.dumps(value) + ' 0'
+            stream = JSONStream(io.StringIO(value_text), chunk_size)
+            if stream.read_value() != value or stream.read_value() != 0:
+                errors.append("read_value differs at chunk size {}".format(
+                    chunk_size))
+            stream = JSONStream(io.StringIO(value_text), chunk_size)
+            stream.skip_value()
+            if stream.read_value() != 0:
+                errors.append("skip_value ends wrongly at chunk size "
+                              "{}".format(chunk_size))
+    return errors
+
+
+def play_levels(game, levels, errors):
+    """
+    Starts each of levels, the data for levels as written in game files, in
+    turn in game, catching every Pokemon, and adds any differences from the
+    level data to errors.
+
+    play_levels(Game, list(dict{str: *}), list(str)) -> None
+    """
+    for number, data in enumerate(levels):
+        try:
+            completed = game.start_next_level()
+        except InvalidGameDataError:
+            errors.append("level {} could not be started".format(number))
+            return
+        if completed:
+            errors.append("game completed before level {}".format(number))
+            return
+        level = game.get_level()
+        if (level.get_size() != (data['rows'], data['columns'])
+                or level.get_terrain() != data['terrain']
+                or level.get_starting_position()
+                != to_lattice(data['player'])):
+            errors.append("level {} differs".format(number))
+        for pokemon in level.get_pokemons():
+            level.catch_pokemon_at(pokemon.get_position())
+
+
+def check_game(text, directory):
+    """
+    Returns a list of the problems found playing text, the text of a game
+    file, through Game, both as it is and with an invalid level part way
+    through.
+
+    check_game(str, str) -> list(str)
+    """
+    errors = []
+    levels = json.loads(text)['levels']
+    good_file = os.path.join(directory, 'good.json')
+    with open(good_file, 'w', encoding='utf-8') as file:
+        file.write(text)
+
+    game = Game()
+    game.load_file(good_file)
+    if len(game) != len(levels):
+        errors.append("Game has {} levels, expected {}".format(
+            len(game), len(levels)))
+    play_levels(game, levels, errors)
+    if not game.start_next_level() or not game.is_complete():
+        errors.append("game is not complete after its last level")
+
+    # The levels after a bad one are never reached, but make it a different
+    # length from the good game
+    bad = len(levels) // 2
+    bad_levels = [dict(level) for level in levels[:bad + 1]] + levels
+    bad_levels[bad]['player'] = [0.25, 0]
+    bad_file = os.path.join(directory, 'bad.json')
+    with open(bad_file, 'w', encoding='utf-8') as file:
+        json.dump({'levels': bad_levels}, file)
+
+    game = Game()
+    game.load_file(good_file)
+    game.start_next_level()
+    current = game.get_level()
+    try:
+        game.load_file(bad_file)
+    except InvalidGameDataError:
+        if bad:
+            errors.append("loading a game with a bad level {} "
+                          "failed".format(bad))
+        elif game.get_level() is not current or len(game) != len(levels):
+            errors.append("failing to load a game replaced the last one")
+        return errors
+    if not bad:
+        errors.append("loading a game with a bad first level succeeded")
+        return errors
+
+    play_levels(game, levels[:bad], errors)
+    if errors:
+        return errors
+    for attempt in range(2):
+        try:
+            game.start_next_level()
+        except InvalidGameDataError:
+            pass
+        else:
+            errors.append("bad level {} was started".format(bad))
+    if game.is_complete():
+        errors.append("game with a bad level is complete")
+    return errors
+
+
+def check_dex(generator, names):
+    """
+    Returns a list of the problems found in the listings of a Dex and a
+    BitsetDex expecting a random sample of names, with some registered.
+
+    check_dex(random.Random, list(str)) -> list(str)
+    """
+    errors = []
+    expected = generator.sample(names, generator.randint(0, 20))
+    if generator.random() < 0.5:
+        expected.append(UNKNOWN_NAME)
+    registered = sorted(generator.sample(expected,
+                                         generator.randint(0, len(expected))))
+    unregistered = sorted(set(expected) - set(registered))
+    pokemons = sorted([(name, True) for name in registered]
+                      + [(name, False) for name in unregistered])
+
+    for dex_class in (Dex, BitsetDex):
+        dex = dex_class(expected)
+        for name in registered:
+            dex.register(name)
+        for attempt in range(2):
+            for method, listing in (
+                    (dex.get_registered_pokemons, registered),
+                    (dex.get_unregistered_pokemons, unregistered),
+                    (dex.get_pokemons, pokemons)):
+                names_listed = method()
+                if names_listed != listing:
+                    errors.append("{}.{} differs".format(
+                        dex_class.__name__, method.__name__))
+                names_listed.append(UNKNOWN_NAME)
+                names_listed.reverse()
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check game file reading and the Dex on random games.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--count', type=int, default=200,
+                        help="number of random games")
+    args = parser.parse_args()
+
+    names = sorted(load_pokemon_ids())
+    generator = random.Random(args.seed)
+    failed = 0
+    with tempfile.TemporaryDirectory() as directory:
+        for number in range(args.count):
+            text = random_game(generator, names)
+            errors = check_stream(text) + check_game(text, directory) \
+                + check_dex(generator, names)
+            if errors:
+                failed += 1
+                print("game {}: {}\n{}\n".format(number, ", ".join(errors),
+                                                 text))
+
+    print("Checked {} games with {} passed/{} failed.".format(
+        args.count, args.count - failed, failed))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -305,7 +305,7 @@ class GridView(tk.Canvas):
             position = pokemon.get_position()
             name = pokemon.get_name()
             id = PokemonManager.get_id_by_name(name)
-            x, y = self._ct.position_to_pixel_centre(*position)
+            x, y = self._ct.position_to_pixel_centre(*from_lattice(position))
 
             colour = self.CAUGHT_COLOUR if name in self._level.get_dex() \
                 else self.UNCAUGHT_COLOUR
@@ -325,7 +325,8 @@ class GridView(tk.Canvas):
             level.get_terrain(),
             DEFAULT_REGION_COLOUR)
 
-        for row, column in level.get_obstacles():
+        for position in level.get_obstacles():
+            row, column = from_lattice(position)
             r1 = r2 = row // 1 + 1
             c1 = c2 = column // 1 + 1
 
@@ -345,7 +346,7 @@ class GridView(tk.Canvas):
 
     def redraw_caught_pokemon(self, row, column, pokemon):
         """
-        Redraws the caught Pokemon at (row, column) position.
+        Redraws the caught Pokemon at (row, column) lattice position.
 
         GridView.redraw_caught_pokemon(GridView, int, int, Pokemon) -> None
         """
@@ -372,12 +373,12 @@ class GridView(tk.Canvas):
 
             image = self._im.get_image(
                 "pokemon/{}/".format(self.CAUGHT_COLOUR), id)
-            x, y = self._ct.position_to_pixel_centre(*position)
+            x, y = self._ct.position_to_pixel_centre(*from_lattice(position))
             self._pokemons[position] = self.create_image(x, y, image=image)
 
     def draw_player_at(self, row, column):
         """
-        Draws player at (row, column) position.
+        Draws player at (row, column) lattice position.
 
         GridView.draw_player_at(GridView, int, int) -> None
         """
@@ -386,7 +387,7 @@ class GridView(tk.Canvas):
             self.delete(self._player)
 
         image = self._im.get_image("players/", self._player_id)
-        x, y = self._ct.position_to_pixel_centre(row, column)
+        x, y = self._ct.position_to_pixel_centre(*from_lattice((row, column)))
 
         self._player = self.create_image(x, y, image=image)
 
@@ -423,6 +424,7 @@ class DexView(tk.Canvas):
         self._cell_width = cell_width
         self._cell_height = cell_height
 
+        self._drawn_version = None
         self.draw()
 
     def draw(self):
@@ -432,9 +434,16 @@ class DexView(tk.Canvas):
         DevView.draw(DexView) -> None
         """
 
+        dex = self._dex
+
+        # Nothing to redraw if the Dex has not changed since the last draw
+        version = dex.get_version() if hasattr(dex, 'get_version') else None
+        if version is not None and version == self._drawn_version:
+            return
+        self._drawn_version = version
+
         self.delete(tk.ALL)
 
-        dex = self._dex
         rows = self._rows
 
         columns = 1
@@ -614,7 +623,13 @@ class PokemonApp(object):
         """
 
         if self._model.get_level().is_complete():
-            if self._model.start_next_level():  # game completed
+            try:
+                completed = self._model.start_next_level()
+            except InvalidGameDataError:
+                self._show_invalid_level()
+                return
+
+            if completed:  # game completed
                 numLevels = len(self._model)
                 messagebox.showinfo("Game Complete",
                                     "Congratulations, you've completed all {} level{}!".format(
@@ -628,6 +643,18 @@ class PokemonApp(object):
             messagebox.showerror("Error",
                                  "You cannot skip to the next level until the current one is complete.")
 
+    def _show_invalid_level(self):
+        """
+        Reports a level of the game that turned out to be invalid when it
+        was read, and ends play.
+
+        PokemonApp._show_invalid_level(PokemonApp) -> None
+        """
+        self._playing = False
+        messagebox.showerror("Invalid Game Data",
+                             "{} does not contain valid data for its next level.".format(
+                                 self._filename))
+
     def show_player_summary(self):
         """
         Shows a summary of the player and what they've caught.
@@ -809,7 +836,11 @@ class PokemonApp(object):
 
         self._playing = True
 
-        self._model.start_next_level()
+        try:
+            self._model.start_next_level()
+        except InvalidGameDataError:
+            self._show_invalid_level()
+            return
         self.load_level()
 
         self.check_complete()